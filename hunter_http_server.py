@@ -1,50 +1,171 @@
 # hunter_http_server.py - Enhanced with comment caching
 
-import json
+import gzip
+import hashlib
 import logging
+import socket
+import ssl
+import threading
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from collections import OrderedDict
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from datetime import datetime
 
 from services.database_service import DatabaseService
-from services.hunter_ai_service import get_hunter_ai_service
+from utils.fastjson import dumps as _dumps
 from utils.url_helpers import get_tweet_url
 
 logger = logging.getLogger(__name__)
 
+# (epoch second, ISO-8601 string, HTTP-date string), refreshed at most once per second
+_cached_now = (0, '', '')
+
+def _timestamps_now():
+    """Return the cached (second, iso, http_date) tuple for the current second"""
+    global _cached_now
+    now = int(time.time())
+    if now != _cached_now[0]:
+        _cached_now = (now, datetime.fromtimestamp(now).isoformat(), formatdate(now, usegmt=True))
+    return _cached_now
+
 class HunterNewsHandler(BaseHTTPRequestHandler):
-    # Class-level cache (shared across all requests)
-    _comment_cache = {}
-    _cache_ttl = 300  # 5 minutes
+    # Keep-alive for the polling dashboard; every response carries Content-Length
+    protocol_version = "HTTP/1.1"
+    # Close idle keep-alive connections quickly so they don't pin worker slots
+    timeout = 5
+    # Send small JSON responses immediately (TCP_NODELAY on each connection)
+    disable_nagle_algorithm = True
     
-    def __init__(self, *args, **kwargs):
-        self.db_service = DatabaseService()
-        self.hunter_ai = get_hunter_ai_service()
-        super().__init__(*args, **kwargs)
+    # Class-level cache (shared across all requests), oldest access first
+    _comment_cache = OrderedDict()
+    _comment_cache_lock = threading.Lock()
+    _cache_ttl = 3600  # idle TTL: each hit extends an entry's lifetime
+    _cache_maxsize = 512  # least recently used entries are evicted beyond this
+    _FALLBACK_COMMENT = "📈 Analysis pending. — Hunter 🐾"
+    # (etag, last_modified) of the most recent /crypto-news-data payload
+    _news_validators = (None, None)
+    # (headlines_version, built_at, data_bytes, etag, last_modified)
+    _news_cache = None
+    # Headline writes invalidate immediately; the TTL only covers headlines
+    # ageing out of the display window between ingests
+    _news_cache_ttl = 60
+    # Serializes rebuilds only; cache hits never take it
+    _news_lock = threading.Lock()
+    # (data_bytes, lastUpdated, gzipped body): the body embeds a per-second
+    # timestamp, so compress at most once per second per payload
+    _news_gzip = (None, None, None)
+    
+    # Header lines shared by every JSON response, precomputed once
+    _JSON_HEADERS = (
+        b'Content-Type: application/json\r\n'
+        b'Access-Control-Allow-Origin: *\r\n'
+    )
+    _status_lines = {}
+    
+    # Fixed response bodies, serialized once
+    _HEALTH_BODY = b'{"status":"ok"}'
+    _NOT_FOUND_BODY = b'{"error":"Not found"}'
+    _NO_TWEETS_BODY = b'{"error":"No tweets found"}'
+    _ERROR_TEMPLATE = b'{"error":%b}'
+    _NEWS_BODY_PREFIX = b'{"success":true,"data":'
+    
+    # Shared by all handler threads; created on first use so /health keeps
+    # answering even if the database is unreachable at startup
+    _db_service = None
+    _hunter_ai = None
+    
+    @property
+    def db_service(self):
+        if HunterNewsHandler._db_service is None:
+            HunterNewsHandler._db_service = DatabaseService()
+        return HunterNewsHandler._db_service
+    
+    @property
+    def hunter_ai(self):
+        if HunterNewsHandler._hunter_ai is None:
+            # Imported on first use so starting the server doesn't load the AI SDK
+            from services.hunter_ai_service import get_hunter_ai_service
+            HunterNewsHandler._hunter_ai = get_hunter_ai_service()
+        return HunterNewsHandler._hunter_ai
+    
+    @staticmethod
+    def _comment_key(headline):
+        """
+        Normalize case and whitespace so feed variants of a headline share an
+        entry, then store a 16-byte digest instead of the full string
+        """
+        normalized = ' '.join(headline.split()).casefold()
+        return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
     
     @classmethod
     def get_cached_comment(cls, headline):
         """Get cached comment or return None if expired/missing"""
-        cache_key = headline
+        cache_key = cls._comment_key(headline)
         now = time.time()
         
-        if cache_key in cls._comment_cache:
-            cached_comment, cached_time = cls._comment_cache[cache_key]
-            if now - cached_time < cls._cache_ttl:
-                logger.debug(f"Cache hit for headline: {headline[:50]}...")
-                return cached_comment
-            else:
-                # Expired, remove from cache
-                del cls._comment_cache[cache_key]
+        with cls._comment_cache_lock:
+            if cache_key in cls._comment_cache:
+                cached_comment, cached_time = cls._comment_cache[cache_key]
+                if now - cached_time < cls._cache_ttl:
+                    # Hot headlines stay cached for as long as they keep being served
+                    cls._comment_cache[cache_key] = (cached_comment, now)
+                    cls._comment_cache.move_to_end(cache_key)
+                    logger.debug(f"Cache hit for headline: {headline[:50]}...")
+                    return cached_comment
+                else:
+                    # Expired, remove from cache
+                    del cls._comment_cache[cache_key]
         
         return None
     
     @classmethod
     def set_cached_comment(cls, headline, comment):
         """Store comment in cache with timestamp"""
-        cls._comment_cache[headline] = (comment, time.time())
+        cache_key = cls._comment_key(headline)
+        with cls._comment_cache_lock:
+            cls._comment_cache[cache_key] = (comment, time.time())
+            cls._comment_cache.move_to_end(cache_key)
+            while len(cls._comment_cache) > cls._cache_maxsize:
+                cls._comment_cache.popitem(last=False)
         logger.debug(f"Cached comment for: {headline[:50]}...")
     
+    @classmethod
+    def prune_comment_cache(cls):
+        """Drop comments that have not been served within the idle TTL"""
+        cutoff = time.time() - cls._cache_ttl
+        expired = 0
+        with cls._comment_cache_lock:
+            # Entries are kept in access order, so expired ones are all at the front
+            while cls._comment_cache:
+                _, cached_time = next(iter(cls._comment_cache.values()))
+                if cached_time >= cutoff:
+                    break
+                cls._comment_cache.popitem(last=False)
+                expired += 1
+        if expired:
+            logger.debug(f"Pruned {expired} expired comments from cache")
+    
+    @classmethod
+    def get_news_validators(cls, data_bytes):
+        """Return (etag, last_modified) for a payload, bumping Last-Modified only when it changes"""
+        etag = 'W/"' + hashlib.blake2b(data_bytes, digest_size=8).hexdigest() + '"'
+        current_etag, last_modified = cls._news_validators
+        if etag != current_etag:
+            last_modified = _timestamps_now()[2]
+            cls._news_validators = (etag, last_modified)
+        return etag, last_modified
+    
+    @classmethod
+    def get_gzipped_news(cls, data_bytes, last_updated, body):
+        """Return the gzipped response body, reusing it for the rest of the second"""
+        cached_data, cached_ts, gz = cls._news_gzip
+        if cached_data is data_bytes and cached_ts == last_updated:
+            return gz
+        gz = gzip.compress(b''.join(body), compresslevel=6)
+        cls._news_gzip = (data_bytes, last_updated, gz)
+        return gz
+    
     def generate_comment_with_fallback(self, headline, existing_comment=None):
         """Generate comment with caching and error handling, prefer existing DB comment"""
         # If we have a comment from the database, use it
@@ -64,152 +185,323 @@ class HunterNewsHandler(BaseHTTPRequestHandler):
             return comment
         except Exception as e:
             logger.error(f"AI failed for headline '{headline[:50]}...': {e}")
-            fallback = "📈 Analysis pending. — Hunter 🐾"
-            return fallback
+            return self._FALLBACK_COMMENT
+    
+    def prefetch_comments(self, headlines):
+        """Fill the comment cache for several headlines with one batched AI call"""
+        try:
+            comments = self.hunter_ai.generate_headline_comments_batch(headlines)
+        except Exception as e:
+            logger.error(f"Batch AI failed for {len(headlines)} headlines: {e}")
+            return
+        for headline, comment in zip(headlines, comments):
+            if comment:
+                self.set_cached_comment(headline, comment)
+    
+    def get_display_headlines(self):
+        """
+        Return (data_bytes, etag, last_modified) for the serialized headline list,
+        rebuilding only after a headline write or once the fallback TTL lapses.
+        """
+        # Read the version before querying so a concurrent ingest invalidates us
+        version = DatabaseService.headlines_version
+        cached = HunterNewsHandler._news_cache
+        if cached and cached[0] == version and time.time() - cached[1] < self._news_cache_ttl:
+            return cached[2], cached[3], cached[4]
+        
+        with self._news_lock:
+            # Another thread may have rebuilt while we waited
+            cached = HunterNewsHandler._news_cache
+            if cached and cached[0] == version and time.time() - cached[1] < self._news_cache_ttl:
+                return cached[2], cached[3], cached[4]
+            return self._rebuild_display_headlines(version)
+    
+    def _rebuild_display_headlines(self, version):
+        """Query, format and serialize the display headlines; caller holds _news_lock"""
+        # Rebuilds are rare, so sweep stale comments here instead of on a timer
+        self.prune_comment_cache()
+        headlines = self.db_service.get_recent_headlines_for_display(count=4, hours=2)
+        if headlines is None:
+            # Query failed: keep serving the last good payload and validators
+            # without touching the cache entry, so the next request retries
+            cached = HunterNewsHandler._news_cache
+            if cached:
+                return cached[2], cached[3], cached[4]
+            raise RuntimeError("Headline query failed and no cached headlines are available")
+        
+        # One AI round-trip for all uncommented headlines; any it misses fall
+        # back to per-headline generation below
+        missing = [
+            h['headline'] for h in headlines
+            if not h.get('hunter_comment') and self.get_cached_comment(h['headline']) is None
+        ]
+        if len(missing) > 1:
+            self.prefetch_comments(missing)
+        
+        formatted_headlines = []
+        backfill = []
+        for h in headlines:
+            # Prefer database comment, fallback to generation
+            comment = self.generate_comment_with_fallback(
+                h['headline'], 
+                existing_comment=h.get('hunter_comment')
+            )
+            if not h.get('hunter_comment') and comment != self._FALLBACK_COMMENT:
+                backfill.append((comment, h['id']))
+            
+            formatted_headlines.append({
+                "headline": h['headline'],
+                "url": h['url'],
+                "hunterComment": comment
+            })
+        
+        # Store generated comments so later rebuilds (and restarts) read them from the DB
+        if backfill:
+            self.db_service.batch_update_headline_comments(backfill)
+        
+        # Serialized once per rebuild; the ETag covers the headline data only,
+        # not the per-request timestamp
+        data_bytes = _dumps(formatted_headlines)
+        etag, last_modified = self.get_news_validators(data_bytes)
+        HunterNewsHandler._news_cache = (
+            version, time.time(), data_bytes, etag, last_modified
+        )
+        return data_bytes, etag, last_modified
+    
+    # Path -> handler method, resolved with a single dict lookup per request
+    _ROUTES = {
+        '/crypto-news-data': '_handle_crypto_news',
+        '/api/latest-tweet': '_handle_latest_tweet',
+        '/health': '_handle_health',
+    }
     
     def do_GET(self):
+        # Polled endpoint first, skipping the route lookup
         if self.path == '/crypto-news-data':
+            self._handle_crypto_news()
+            return
+        route = self._ROUTES.get(self.path.split('?', 1)[0])
+        if route is None:
+            self._send_json(404, self._NOT_FOUND_BODY)
+            return
+        getattr(self, route)()
+    
+    def _handle_crypto_news(self):
+        try:
+            data_bytes, etag, last_modified = self.get_display_headlines()
+            validator_headers = (
+                f"ETag: {etag}\r\nLast-Modified: {last_modified}\r\n"
+                "Vary: Accept-Encoding\r\n".encode('ascii')
+            )
+            if self.headers.get('If-None-Match') == etag:
+                self._write_response(
+                    304, None, validator_headers + b'Access-Control-Allow-Origin: *\r\n'
+                )
+                return
+            
+            # {"success":true,"data":<cached bytes>,"lastUpdated":"..."} without re-serializing
+            last_updated = _timestamps_now()[1]
+            body = (
+                self._NEWS_BODY_PREFIX,
+                data_bytes,
+                b',"lastUpdated":"' + last_updated.encode('ascii') + b'"}',
+            )
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = self.get_gzipped_news(data_bytes, last_updated, body)
+                validator_headers += b'Content-Encoding: gzip\r\n'
+            
             try:
-                headlines = self.db_service.get_recent_headlines_for_display(count=4, hours=2)
-                
-                formatted_headlines = []
-                for h in headlines:
-                    # Prefer database comment, fallback to generation
-                    comment = self.generate_comment_with_fallback(
-                        h['headline'], 
-                        existing_comment=h.get('hunter_comment')
-                    )
-                    
-                    formatted_headlines.append({
-                        "headline": h['headline'],
-                        "url": h['url'],
-                        "hunterComment": comment
-                    })
-                
-                response = {
-                    "success": True,
-                    "data": formatted_headlines,
-                    "lastUpdated": datetime.now().isoformat()
-                }
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                
-                try:
-                    self.wfile.write(json.dumps(response).encode('utf-8'))
-                except BrokenPipeError:
-                    logger.warning("Client disconnected before response completed")
-                    return
-                
+                self._send_json(200, body, validator_headers)
             except BrokenPipeError:
+                logger.warning("Client disconnected before response completed")
                 return
-            except Exception as e:
-                logger.error(f"Error: {e}")
-                try:
-                    self._send_error(500, str(e))
-                except BrokenPipeError:
-                    return
-        
-        elif self.path == '/api/latest-tweet':
-            # ... existing code ...
+            
+        except BrokenPipeError:
+            return
+        except Exception as e:
+            logger.error(f"Error: {e}")
             try:
-                # Query the latest tweet from content_log
-                with self.db_service.get_connection() as conn:
-                    with conn.cursor() as cur:
-                        cur.execute("""
-                            SELECT 
-                                content_type,
-                                tweet_id,
-                                details,
-                                created_at
-                            FROM hunter_agent.content_log
-                            WHERE tweet_id IS NOT NULL
-                            ORDER BY created_at DESC
-                            LIMIT 1
-                        """)
-                        result = cur.fetchone()
-                
-                if not result:
-                    self._send_error(404, "No tweets found")
-                    return
-                
-                content_type, tweet_id, details, created_at = result
-                
-                # Calculate "time ago"
-                now = datetime.utcnow()
-                if created_at.tzinfo is not None:
-                    created_at = created_at.replace(tzinfo=None)
-                
-                delta = now - created_at
-                if delta.days > 0:
-                    time_ago = f"{delta.days}d ago"
-                elif delta.seconds >= 3600:
-                    time_ago = f"{delta.seconds // 3600}h ago"
-                elif delta.seconds >= 60:
-                    time_ago = f"{delta.seconds // 60}m ago"
-                else:
-                    time_ago = "just now"
-                
-                # Truncate text for preview (150 chars)
-                preview_text = details[:150] + "..." if len(details) > 150 else details
-                
-                # Construct tweet URL
-                tweet_url = get_tweet_url("Web3_Dobie", tweet_id)
-                
-                response = {
-                    "success": True,
-                    "data": {
-                        "id": tweet_id,
-                        "text": preview_text,
-                        "fullText": details,
-                        "type": content_type,
-                        "createdAt": created_at.isoformat(),
-                        "timeAgo": time_ago,
-                        "url": tweet_url,
-                        "user": {
-                            "id": "web3_dobie",
-                            "username": "Web3_Dobie",
-                            "name": "Web3 Dobie"
-                        }
+                self._send_error(500, str(e))
+            except BrokenPipeError:
+                return
+    
+    def _handle_latest_tweet(self):
+        try:
+            result = self.db_service.get_latest_tweet()
+            
+            if not result:
+                self._send_json(404, self._NO_TWEETS_BODY)
+                return
+            
+            content_type, tweet_id, details, created_at = result
+            
+            # Calculate "time ago"
+            now = datetime.utcnow()
+            if created_at.tzinfo is not None:
+                created_at = created_at.replace(tzinfo=None)
+            
+            delta = now - created_at
+            if delta.days > 0:
+                time_ago = f"{delta.days}d ago"
+            elif delta.seconds >= 3600:
+                time_ago = f"{delta.seconds // 3600}h ago"
+            elif delta.seconds >= 60:
+                time_ago = f"{delta.seconds // 60}m ago"
+            else:
+                time_ago = "just now"
+            
+            # Truncate text for preview (150 chars)
+            preview_text = details[:150] + "..." if len(details) > 150 else details
+            
+            # Construct tweet URL
+            tweet_url = get_tweet_url("Web3_Dobie", tweet_id)
+            
+            response = {
+                "success": True,
+                "data": {
+                    "id": tweet_id,
+                    "text": preview_text,
+                    "fullText": details,
+                    "type": content_type,
+                    "createdAt": created_at,
+                    "timeAgo": time_ago,
+                    "url": tweet_url,
+                    "user": {
+                        "id": "web3_dobie",
+                        "username": "Web3_Dobie",
+                        "name": "Web3 Dobie"
                     }
                 }
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(response).encode('utf-8'))
-                
+            }
+            
+            self._send_json(200, _dumps(response))
+            
+        except BrokenPipeError:
+            return
+        except Exception as e:
+            logger.error(f"Error fetching latest tweet: {e}", exc_info=True)
+            try:
+                self._send_error(500, str(e))
             except BrokenPipeError:
                 return
-            except Exception as e:
-                logger.error(f"Error fetching latest tweet: {e}", exc_info=True)
-                try:
-                    self._send_error(500, str(e))
-                except BrokenPipeError:
-                    return
+    
+    def _handle_health(self):
+        self._send_json(200, self._HEALTH_BODY)
+    
+    def _send_error(self, code, message):
+        self._send_json(code, self._ERROR_TEMPLATE % _dumps(message))
+    
+    def _status_line(self, code):
+        """Cached 'HTTP/x.y CODE Reason' line for this handler's protocol"""
+        key = (self.protocol_version, code)
+        line = self._status_lines.get(key)
+        if line is None:
+            phrase = self.responses.get(code, ('',))[0]
+            line = f"{self.protocol_version} {code} {phrase}\r\n".encode('latin-1')
+            self._status_lines[key] = line
+        return line
+    
+    def _write_response(self, code, body, headers):
+        """
+        Emit status line, headers and body in a single scatter-gather write.
+        body is bytes, a tuple of buffers sent back to back, or None (304).
+        """
+        self.log_request(code)
+        head = (
+            self._status_line(code)
+            + f"Date: {_timestamps_now()[2]}\r\n".encode('ascii')
+            + headers
+        )
+        if body is None:
+            self._write_parts((head + b'\r\n',))
+            return
         
-        elif self.path == '/health':
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({"status": "ok"}).encode())
+        parts = body if isinstance(body, tuple) else (body,)
+        length = sum(len(p) for p in parts)
+        self._write_parts(
+            (head + b'Content-Length: ' + str(length).encode('ascii') + b'\r\n\r\n',) + parts
+        )
+    
+    def _write_parts(self, parts):
+        """Scatter-gather the buffers onto the socket in as few sendmsg calls as possible"""
+        sock = self.connection
+        if isinstance(sock, ssl.SSLSocket) or not hasattr(sock, 'sendmsg'):
+            self.wfile.write(b''.join(parts))
+            return
         
-        else:
-            self._send_error(404, "Not found")
+        self.wfile.flush()
+        views = [memoryview(p) for p in parts if p]
+        while views:
+            sent = sock.sendmsg(views)
+            # Drop fully-sent buffers and trim a partially-sent one
+            while views and sent >= len(views[0]):
+                sent -= len(views[0])
+                views.pop(0)
+            if views and sent:
+                views[0] = views[0][sent:]
     
-    def _send_error(self, code, message):
-        self.send_response(code)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps({"error": message}).encode())
+    def _send_json(self, code, body, extra_headers=b''):
+        self._write_response(code, body, self._JSON_HEADERS + extra_headers)
     
     def log_message(self, format, *args):
         pass
 
+class HunterHTTPServer(ThreadingHTTPServer):
+    """
+    Handlers block on Postgres and the AI provider, so serve each connection
+    on its own thread instead of queueing behind a slow one, up to max_workers
+    at a time. Connections beyond that get an immediate 503 so idle keep-alive
+    sockets can never stall the accept loop.
+    """
+    daemon_threads = True
+    request_queue_size = 128  # absorb connection bursts instead of the default 5
+    # Each handler may hold a pooled DB connection, and the pool raises instead
+    # of blocking when empty, so stay below its size and leave room for job threads
+    db_connections_for_jobs = 10
+    max_workers = DatabaseService.POOL_MAXCONN - db_connections_for_jobs
+    _BUSY_RESPONSE = (
+        b"HTTP/1.1 503 Service Unavailable\r\n"
+        b"Content-Type: application/json\r\n"
+        b"Content-Length: 26\r\n"
+        b"Retry-After: 1\r\n"
+        b"Connection: close\r\n"
+        b"\r\n"
+        b'{"error": "server busy"}\r\n'
+    )
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._worker_slots = threading.BoundedSemaphore(self.max_workers)
+    
+    def process_request(self, request, client_address):
+        # Never block the accept loop: when every worker is busy, refuse the
+        # connection with a 503 instead of spawning more threads
+        if not self._worker_slots.acquire(blocking=False):
+            try:
+                request.settimeout(1)
+                request.sendall(self._BUSY_RESPONSE)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self._worker_slots.release()
+            raise
+    
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._worker_slots.release()
+    
+    def server_bind(self):
+        # Accepted sockets inherit SO_KEEPALIVE, so dead peers get reaped
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        super().server_bind()
+
 def start_hunter_server(port=3001):
-    server = HTTPServer(('0.0.0.0', port), HunterNewsHandler)
+    server = HunterHTTPServer(('0.0.0.0', port), HunterNewsHandler)
     logger.info(f"Hunter server on port {port}")
     server.serve_forever()
\ No newline at end of file
@@ -1,88 +1,113 @@
-﻿import csv
+﻿import logging
 import os
 from datetime import datetime
 
+import pandas as pd
+
 TWEET_LOG_FILE = "data/tweet_log.csv"
 EXPORT_FILE = None  # Leave as None to auto-detect the latest export
 OUTPUT_FILE = "data/tweet_metrics_enriched.csv"
 EXPORT_FOLDER = "data"
 
+logger = logging.getLogger(__name__)
+
 
 def detect_latest_x_export():
-    files = [
-        f
-        for f in os.listdir(EXPORT_FOLDER)
-        if f.startswith("account_analytics_content") and f.endswith(".csv")
-    ]
-    if not files:
+    # scandir entries cache their stat() result, so each candidate is stat'ed once
+    with os.scandir(EXPORT_FOLDER) as it:
+        entries = [
+            e
+            for e in it
+            if e.name.startswith("account_analytics_content") and e.name.endswith(".csv")
+        ]
+    if not entries:
         raise FileNotFoundError("❌ No X analytics export file found in /data/")
-    latest = max(files, key=lambda f: os.path.getctime(os.path.join(EXPORT_FOLDER, f)))
-    return os.path.join(EXPORT_FOLDER, latest)
+    latest = max(entries, key=lambda e: e.stat().st_ctime)
+    return os.path.join(EXPORT_FOLDER, latest.name)
+
 
+METRIC_COLUMNS = {"Likes": "likes", "Retweets": "retweets", "Replies": "replies", "Impressions": "impressions"}
+TWEET_LOG_COLUMNS = ["tweet_id", "timestamp", "type", "category"]
+EXPORT_COLUMNS = ["Post id", *METRIC_COLUMNS]
 
-def load_csv_dict(filepath, key_field):
-    with open(filepath, newline="", encoding="utf-8") as f:
-        return {row[key_field]: row for row in csv.DictReader(f)}
+
+def load_csv_frame(filepath, columns):
+    # Keep every field as the raw string (no NaN for blanks) so IDs match exactly;
+    # only the listed columns are parsed, the rest of the export is skipped
+    return pd.read_csv(
+        filepath,
+        dtype=str,
+        keep_default_na=False,
+        encoding="utf-8",
+        usecols=lambda c: c in columns,
+    )
 
 
 def import_metrics():
     export_path = EXPORT_FILE or detect_latest_x_export()
     print(f"📥 Using X export file: {export_path}")
 
-    tweet_log = load_csv_dict(TWEET_LOG_FILE, key_field="tweet_id")
-    print("tweet_log keys (first 5):", list(tweet_log.keys())[:5])
-
-    with open(export_path, newline="", encoding="utf-8") as f:
-        export = list(csv.DictReader(f))
-    export_ids = [str(row.get("Post id", "")).strip().split(".")[0] for row in export]
-    print("export tweet_ids (first 5):", export_ids[:5])
-
-    enriched_rows = []
-    # filepath: /home/Hunter/X-AI-Agent/import_x_metrics.py
-    for row in export:
-        tweet_id = str(row.get("Post id", "")).strip().split(".")[0]
-        if tweet_id not in tweet_log:
-            print(f"Not found in tweet_log: '{tweet_id}'")
-            continue
-
-        base = tweet_log[tweet_id]
-        try:
-            likes = int(row.get("Likes", 0))
-            retweets = int(row.get("Retweets", 0))
-            replies = int(row.get("Replies", 0))
-            impressions = int(row.get("Impressions", 0))
-
-            engagement_score = (
-                likes * 1 + retweets * 2 + replies * 1.5 + impressions * 0.01
-            )
-
-            enriched_rows.append(
-                {
-                    "tweet_id": tweet_id,
-                    "date": base["timestamp"],
-                    "type": base["type"],
-                    "url": base["category"],
-                    "likes": likes,
-                    "retweets": retweets,
-                    "replies": replies,
-                    "impressions": impressions,
-                    "engagement_score": round(engagement_score, 2),
-                }
-            )
-        except Exception as e:
-            print(f"⚠️ Skipping tweet {tweet_id}: {e}")
-
-    if not enriched_rows:
+    # Later rows win on duplicate tweet_ids, as with a dict keyed by tweet_id
+    tweet_log = load_csv_frame(TWEET_LOG_FILE, TWEET_LOG_COLUMNS).drop_duplicates("tweet_id", keep="last")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("tweet_log keys (first 5): %s", tweet_log["tweet_id"].head(5).tolist())
+
+    export = load_csv_frame(export_path, EXPORT_COLUMNS)
+    if "Post id" not in export:
+        export["Post id"] = ""
+    export["tweet_id"] = export["Post id"].str.strip().str.split(".").str[0]
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("export tweet_ids (first 5): %s", export["tweet_id"].head(5).tolist())
+
+    merged = export.merge(
+        tweet_log,
+        on="tweet_id",
+        how="inner",
+    )
+    unmatched = len(export) - len(merged)
+    if unmatched:
+        print(f"Not found in tweet_log: {unmatched} export rows")
+        if logger.isEnabledFor(logging.DEBUG):
+            missing = export.loc[~export["tweet_id"].isin(tweet_log["tweet_id"]), "tweet_id"]
+            logger.debug("Unmatched tweet_ids: %s", missing.tolist())
+
+    # Missing metric columns count as 0; unparseable values drop the row
+    metrics = pd.DataFrame(
+        {
+            name: pd.to_numeric(merged[col], errors="coerce") if col in merged else 0
+            for col, name in METRIC_COLUMNS.items()
+        },
+        index=merged.index,
+    )
+    valid = metrics.notna().all(axis=1)
+    if not valid.all():
+        print(f"⚠️ Skipping {int((~valid).sum())} tweets with non-numeric metrics")
+    merged, metrics = merged[valid], metrics[valid].astype(int)
+
+    if merged.empty:
         print("❌ No tweets matched between log and export.")
         return
 
-    # ✅ Sort by engagement score descending
-    enriched_rows.sort(key=lambda r: float(r["engagement_score"]), reverse=True)
-
-    with open(OUTPUT_FILE, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=enriched_rows[0].keys())
-        writer.writeheader()
-        writer.writerows(enriched_rows)
+    enriched = pd.DataFrame(
+        {
+            "tweet_id": merged["tweet_id"],
+            "date": merged["timestamp"],
+            "type": merged["type"],
+            "url": merged["category"],
+            **metrics,
+            "engagement_score": (
+                metrics["likes"] * 1
+                + metrics["retweets"] * 2
+                + metrics["replies"] * 1.5
+                + metrics["impressions"] * 0.01
+            ).round(2),
+        }
+    )
+
+    # ✅ Sort by engagement score descending (stable, so ties keep export order)
+    enriched = enriched.sort_values("engagement_score", ascending=False, kind="mergesort")
+    # Columns are built in output order, so write without a reindexing copy
+    enriched.to_csv(OUTPUT_FILE, index=False, encoding="utf-8", lineterminator="\r\n")
 
     print(f"✅ Wrote enriched metrics to: {OUTPUT_FILE}")
 
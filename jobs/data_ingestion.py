@@ -5,12 +5,17 @@ It fetches from RSS, scores/filters in-memory, and inserts high-quality headline
 This replaces the old workflow spread across utils/rss_fetch.py and utils/scorer.py.
 """
 
+import hashlib
 import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Tuple
 
-from services.database_service import DatabaseService
+from services.database_service import get_database_service
 from services.ai_service import get_ai_service
+from utils import fastjson
+from utils.config import DATA_DIR
 import feedparser
 from datetime import datetime, timedelta
 
@@ -20,72 +25,205 @@ logger = logging.getLogger(__name__)
 # --- RSS Fetching (from rss_fetch.py) ---
 # -----------------------------------------------------------------------------
 
-def fetch_all_rss_feeds() -> List[Dict]:
+RSS_FEED_URLS = {
+    "binance":       "https://www.binance.com/en/feed/news/all",
+    "coindesk":      "https://www.coindesk.com/arc/outboundfeeds/rss/",
+    "decrypt":       "https://decrypt.co/feed",
+    "cryptoslate":   "https://cryptoslate.com/feed/",
+    "beincrypto":    "https://www.beincrypto.com/feed/",
+    "cointelegraph": "https://cointelegraph.com/rss",
+    "bitcoinmag":    "https://bitcoinmagazine.com/feed",
+    "cryptobriefing":"https://cryptobriefing.com/feed",
+    "theblock":      "https://www.theblock.co/rss.xml",
+    "cryptonews":    "https://cryptonews.com/news/feed/",
+    "bitcoinist":    "https://bitcoinist.com/feed/",
+    "blockchainnews":"https://blockchain.news/RSS",
+    "cryptopotato":  "https://cryptopotato.com/feed/",
+    "newsbtc":       "https://www.newsbtc.com/feed/",
+    "bitcoinnews":   "https://news.bitcoin.com/feed/",    
+}
+
+# Per-feed ETag / Last-Modified from the previous run, for conditional GETs
+RSS_VALIDATORS_FILE = os.path.join(DATA_DIR, "rss_feed_validators.json")
+
+def _load_feed_validators() -> Dict[str, Dict]:
+    try:
+        with open(RSS_VALIDATORS_FILE, 'rb') as f:
+            return fastjson.loads(f.read())
+    except (FileNotFoundError, ValueError):  # ValueError covers both parsers' decode errors
+        return {}
+
+def _save_feed_validators(validators: Dict[str, Dict]):
+    try:
+        tmp_path = RSS_VALIDATORS_FILE + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(fastjson.dumps(validators))
+        os.replace(tmp_path, RSS_VALIDATORS_FILE)
+    except OSError as e:
+        logging.warning(f"Could not save RSS feed validators: {e}")
+
+def _fetch_feed(source_name: str, feed_url: str, cutoff_time: datetime,
+                validator: Dict) -> Tuple[List[Dict], Dict]:
     """
-    Fetches raw headlines from all configured RSS sources.
+    Fetches and filters a single RSS source with a conditional GET.
+    Returns (headlines, validator for the next run). Runs on a worker thread,
+    so all errors are logged and swallowed here.
+    """
+    headlines = []
+    try:
+        logging.info(f"Fetching from {source_name}...")
+        feed = feedparser.parse(
+            feed_url,
+            etag=validator.get('etag'),
+            modified=validator.get('modified')
+        )
+        
+        if feed.get('status') == 304:  # Unchanged since last run
+            logging.info(f"{source_name} not modified, skipping")
+            return headlines, validator
+        
+        if feed.bozo:  # Feed parsing error
+            logging.warning(f"Error parsing {source_name}: {feed.bozo_exception}")
+            return headlines, validator
+        
+        validator = {'etag': feed.get('etag'), 'modified': feed.get('modified')}
+        
+        for entry in feed.entries[:20]:  # Limit to 20 most recent per source
+            try:
+                title = entry.get('title', '').strip()
+                link = entry.get('link', '')
+                
+                # Skip if no title or link
+                if not title or not link:
+                    continue
+                
+                # Check if article is recent (optional time filtering)
+                pub_date = entry.get('published_parsed') or entry.get('updated_parsed')
+                if pub_date:
+                    article_time = datetime(*pub_date[:6])
+                    if article_time < cutoff_time:
+                        continue
+                
+                headlines.append({
+                    "headline": title,
+                    "url": link,
+                    "source": source_name
+                })
+                
+            except Exception as e:
+                logging.debug(f"Error processing entry from {source_name}: {e}")
+                continue
+                
+    except Exception as e:
+        logging.error(f"Failed to fetch from {source_name}: {e}")
+    
+    return headlines, validator
+
+def fetch_all_rss_feeds() -> Tuple[List[Dict], Dict[str, Dict]]:
     """
-    RSS_FEED_URLS = {
-        "binance":       "https://www.binance.com/en/feed/news/all",
-        "coindesk":      "https://www.coindesk.com/arc/outboundfeeds/rss/",
-        "decrypt":       "https://decrypt.co/feed",
-        "cryptoslate":   "https://cryptoslate.com/feed/",
-        "beincrypto":    "https://www.beincrypto.com/feed/",
-        "cointelegraph": "https://cointelegraph.com/rss",
-        "bitcoinmag":    "https://bitcoinmagazine.com/feed",
-        "cryptobriefing":"https://cryptobriefing.com/feed",
-        "theblock":      "https://www.theblock.co/rss.xml",
-        "cryptonews":    "https://cryptonews.com/news/feed/",
-        "bitcoinist":    "https://bitcoinist.com/feed/",
-        "blockchainnews":"https://blockchain.news/RSS",
-        "cryptopotato":  "https://cryptopotato.com/feed/",
-        "newsbtc":       "https://www.newsbtc.com/feed/",
-        "bitcoinnews":   "https://news.bitcoin.com/feed/",    
-    }
+    Fetches raw headlines from all configured RSS sources.
+    Feeds are fetched concurrently and conditionally (unchanged feeds return 304);
+    results keep the RSS_FEED_URLS source order.
     
+    Returns (headlines, validators). The updated ETag/Last-Modified validators
+    are not persisted here: the caller saves them with _save_feed_validators()
+    once the headlines are safely stored, so a failed run refetches them.
+    """
     all_headlines = []
     cutoff_time = datetime.now() - timedelta(hours=2)  # Only get recent articles
+    validators = _load_feed_validators()
     
-    for source_name, feed_url in RSS_FEED_URLS.items():
-        try:
-            logging.info(f"Fetching from {source_name}...")
-            feed = feedparser.parse(feed_url)
-            
-            if feed.bozo:  # Feed parsing error
-                logging.warning(f"Error parsing {source_name}: {feed.bozo_exception}")
-                continue
-            
-            for entry in feed.entries[:20]:  # Limit to 20 most recent per source
-                try:
-                    title = entry.get('title', '').strip()
-                    link = entry.get('link', '')
-                    
-                    # Skip if no title or link
-                    if not title or not link:
-                        continue
-                    
-                    # Check if article is recent (optional time filtering)
-                    pub_date = entry.get('published_parsed') or entry.get('updated_parsed')
-                    if pub_date:
-                        article_time = datetime(*pub_date[:6])
-                        if article_time < cutoff_time:
-                            continue
-                    
-                    all_headlines.append({
-                        "headline": title,
-                        "url": link,
-                        "source": source_name
-                    })
-                    
-                except Exception as e:
-                    logging.debug(f"Error processing entry from {source_name}: {e}")
-                    continue
-                    
-        except Exception as e:
-            logging.error(f"Failed to fetch from {source_name}: {e}")
-            continue
+    with ThreadPoolExecutor(max_workers=len(RSS_FEED_URLS)) as executor:
+        results = executor.map(
+            lambda source: _fetch_feed(source[0], source[1], cutoff_time, validators.get(source[0], {})),
+            RSS_FEED_URLS.items()
+        )
+        for source_name, (headlines, validator) in zip(RSS_FEED_URLS, results):
+            all_headlines.extend(headlines)
+            validators[source_name] = validator
     
     logging.info(f"Fetched {len(all_headlines)} total headlines from {len(RSS_FEED_URLS)} sources")
-    return all_headlines
+    return all_headlines, validators
+
+# -----------------------------------------------------------------------------
+# --- Pre-LLM Screening ---
+# -----------------------------------------------------------------------------
+
+# Promotional markers that never make it past scoring; one compiled alternation.
+# Only whole labels: bare "promoted"/"sponsored" also match real news
+# ("promoted to CEO", "state-sponsored hackers")
+_DENYLIST_RE = re.compile(
+    r'\b(?:(?:sponsored|promoted|paid) (?:content|post|article)|advertorial)\b'
+    r'|^\s*sponsored\s*:|[\[(]sponsored[\])]',
+    re.IGNORECASE
+)
+
+def _normalize_title(title: str) -> str:
+    return ' '.join(title.split()).casefold()
+
+_SIMHASH_MAX_DISTANCE = 3  # bits; titles this close are treated as the same story
+_SIMHASH_BANDS = 4         # 64 bits in 16-bit bands: a match within 3 bits shares a band
+
+def _simhash(text: str) -> int:
+    """64-bit SimHash over character 3-grams of a normalized title."""
+    weights = [0] * 64
+    for i in range(max(len(text) - 2, 1)):
+        h = int.from_bytes(hashlib.blake2b(text[i:i + 3].encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+class _SimHashIndex:
+    """Near-duplicate lookup: candidates come from band buckets, not a full scan."""
+    def __init__(self):
+        self._buckets: Dict[Tuple[int, int], List[int]] = {}
+    
+    def _bands(self, value: int):
+        for band in range(_SIMHASH_BANDS):
+            yield band, value >> (band * 16) & 0xFFFF
+    
+    def add(self, value: int):
+        for key in self._bands(value):
+            self._buckets.setdefault(key, []).append(value)
+    
+    def has_near(self, value: int) -> bool:
+        for key in self._bands(value):
+            for other in self._buckets.get(key, ()):
+                if bin(value ^ other).count('1') <= _SIMHASH_MAX_DISTANCE:
+                    return True
+        return False
+
+def _screen_headlines(items: List[Dict], known: List[Tuple[str, str]]) -> List[Dict]:
+    """
+    Drops headlines that don't need an LLM call: promotional posts, items already
+    stored (by URL or title), and repeats within this fetch, including the same
+    story reworded slightly by another source.
+    """
+    seen_urls = {url for _, url in known}
+    seen_titles = set()
+    near_index = _SimHashIndex()
+    for headline, _ in known:
+        title_key = _normalize_title(headline)
+        seen_titles.add(title_key)
+        near_index.add(_simhash(title_key))
+    
+    screened = []
+    for item in items:
+        title_key = _normalize_title(item["headline"])
+        if item["url"] in seen_urls or title_key in seen_titles:
+            continue
+        if _DENYLIST_RE.search(item["headline"]):
+            continue
+        fingerprint = _simhash(title_key)
+        if near_index.has_near(fingerprint):
+            continue
+        seen_urls.add(item["url"])
+        seen_titles.add(title_key)
+        near_index.add(fingerprint)
+        screened.append(item)
+    
+    logging.info(f"Screening kept {len(screened)}/{len(items)} headlines for scoring")
+    return screened
 
 # -----------------------------------------------------------------------------
 # --- Scoring Logic (from scorer.py) ---
@@ -97,19 +235,17 @@ def _extract_ticker(headline: str) -> str:
     match = re.search(r'\$([A-Z]{3,5})\b', headline)
     return match.group(1) if match else ""
 
+# Matches every non-blank line, capturing the first category word on it (if any)
+_CATEGORY_LINE_RE = re.compile(r'^(?=[^\n]*\S)[^\n]*?(?:\b(high|moderate|low)\b|$)', re.IGNORECASE | re.MULTILINE)
+
 def _parse_batch_scores(response: str, expected_count: int) -> List[int]:
     """Parses categories (High, Moderate, Low) and maps them to numerical scores."""
     score_map = {'high': 8, 'moderate': 5, 'low': 2}
-    scores = []
-    lines = response.strip().split('\n')
-    
-    for line in lines:
-        clean_line = line.strip().lower()
-        found_category = None
-        if 'high' in clean_line: found_category = 'high'
-        elif 'moderate' in clean_line: found_category = 'moderate'
-        elif 'low' in clean_line: found_category = 'low'
-        scores.append(score_map.get(found_category, score_map['low']))
+    # One score per non-blank line: its first category word, or Low if it has none
+    scores = [
+        score_map[(match.group(1) or 'low').lower()]
+        for match in _CATEGORY_LINE_RE.finditer(response)
+    ]
 
     if len(scores) < expected_count:
         scores.extend([score_map['low']] * (expected_count - len(scores)))
@@ -142,15 +278,18 @@ CLASSIFICATION:
 """
     return prompt, processed_items
 
-def _score_and_filter_headlines(items: List[Dict], min_category: str = 'high', batch_size: int = 9) -> List[Dict]:
+def _score_and_filter_headlines(items: List[Dict], min_category: str = 'high', batch_size: int = 9) -> Tuple[List[Dict], bool]:
     """
     Scores headlines in batches and generates Hunter comments for high-scoring ones.
-    RETURNS a filtered list of high-scoring headlines with comments.
+    RETURNS (accepted, complete): the filtered list of high-scoring headlines with
+    comments, and False if any scoring batch failed, so the caller can tell an AI
+    outage apart from nothing meeting the threshold.
     """
-    if not items: return []
+    if not items: return [], True
     logging.info(f"Starting batch scoring for {len(items)} headlines...")
 
     all_accepted_results = []
+    failed_batches = 0
     ai_service = get_ai_service()
     from services.hunter_ai_service import get_hunter_ai_service
     hunter_ai = get_hunter_ai_service()
@@ -167,35 +306,43 @@ def _score_and_filter_headlines(items: List[Dict], min_category: str = 'high', b
             if not response: raise ValueError("API call returned an empty response.")
             scores = _parse_batch_scores(response, len(processed_items))
 
+            accepted = []
             for item, score in zip(processed_items, scores):
                 current_level = 1
                 if score >= 8: current_level = 3
                 elif score >= 5: current_level = 2
 
                 if current_level >= min_level:
-                    # Generate Hunter comment for high-scoring headlines
-                    try:
-                        hunter_comment = hunter_ai.generate_headline_comment(item["headline"])
-                        logging.debug(f"Generated comment for: {item['headline'][:50]}...")
-                    except Exception as e:
-                        logging.warning(f"Failed to generate comment for headline: {e}")
-                        hunter_comment = None  # Will be generated on-demand later
-                    
-                    record = {
-                        "headline": item["headline"], 
-                        "url": item["url"], 
-                        "ticker": item["ticker"],
-                        "score": score, 
-                        "source": item.get("source"),
-                        "ai_provider": ai_service.provider.value,
-                        "hunter_comment": hunter_comment
-                    }
-                    all_accepted_results.append(record)
+                    accepted.append((item, score))
+            
+            if not accepted:
+                continue
+            
+            # Generate Hunter comments for the batch's high-scoring headlines in one call
+            try:
+                comments = hunter_ai.generate_headline_comments_batch([item["headline"] for item, _ in accepted])
+                logging.debug(f"Generated {sum(1 for c in comments if c)} comments for {len(accepted)} headlines")
+            except Exception as e:
+                logging.warning(f"Failed to generate comments for batch: {e}")
+                comments = [None] * len(accepted)  # Will be generated on-demand later
+            
+            for (item, score), hunter_comment in zip(accepted, comments):
+                record = {
+                    "headline": item["headline"], 
+                    "url": item["url"], 
+                    "ticker": item["ticker"],
+                    "score": score, 
+                    "source": item.get("source"),
+                    "ai_provider": ai_service.provider.value,
+                    "hunter_comment": hunter_comment
+                }
+                all_accepted_results.append(record)
         except Exception as e:
+            failed_batches += 1
             logging.error(f"Error processing scoring batch: {e}")
 
-    logging.info(f"Scoring complete: {len(all_accepted_results)} total headlines accepted.")
-    return all_accepted_results
+    logging.info(f"Scoring complete: {len(all_accepted_results)} total headlines accepted, {failed_batches} batches failed.")
+    return all_accepted_results, failed_batches == 0
 
 # -----------------------------------------------------------------------------
 # --- Main Job Orchestration ---
@@ -209,27 +356,44 @@ def run_headline_ingestion_job():
     logging.info("--- Starting Headline Ingestion Job ---")
     
     # 1. Fetch raw headlines from RSS sources (in-memory)
-    raw_headlines = fetch_all_rss_feeds()
+    raw_headlines, feed_validators = fetch_all_rss_feeds()
     if not raw_headlines:
+        _save_feed_validators(feed_validators)
         logging.info("No headlines fetched from RSS. Job complete.")
         return
 
-    # 2. Score and filter the headlines in-memory (now with comments)
-    high_scoring_headlines = _score_and_filter_headlines(raw_headlines, min_category='high')
+    db_service = get_database_service()
     
+    # 2. Screen out spam and already-stored headlines before paying for LLM calls
+    candidates = _screen_headlines(raw_headlines, db_service.get_recent_headline_keys(hours=24))
+    if not candidates:
+        _save_feed_validators(feed_validators)
+        logging.info("No new headlines after screening. Job complete.")
+        return
+
+    # 3. Score and filter the headlines in-memory (now with comments)
+    high_scoring_headlines, scoring_complete = _score_and_filter_headlines(candidates, min_category='high')
+    
+    # Advance the feed validators only once every candidate was scored (and, below,
+    # stored); after an AI or database failure the next run must see the same items again
     if not high_scoring_headlines:
+        if scoring_complete:
+            _save_feed_validators(feed_validators)
         logging.info("No headlines met the minimum score threshold. Job complete.")
         return
         
-    # 3. Prepare and insert the filtered headlines with comments into the database
-    db_service = DatabaseService()
-    
+    # 4. Prepare and insert the filtered headlines with comments into the database
     headlines_to_insert = [
         (h['headline'], h['url'], h.get('source'), h.get('ticker'), h['score'], h['ai_provider'], h.get('hunter_comment'))
         for h in high_scoring_headlines
     ]
     
     inserted_count = db_service.batch_insert_headlines_with_comments(headlines_to_insert)
+    if inserted_count is None:
+        logging.error("Headline insert failed; feed validators left unchanged for the next run.")
+        return
+    if scoring_complete:
+        _save_feed_validators(feed_validators)
     
     logging.info(f"--- Headline Ingestion Job Complete ---")
     logging.info(f"Accepted and inserted {inserted_count} new high-scoring headlines with comments into the database.")
\ No newline at end of file
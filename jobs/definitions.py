@@ -1,36 +1,24 @@
 # job_definitions.py - Define and register all scheduled jobs with proper logging
 import logging
-from datetime import datetime
-from .registry import JobRegistry, JobCategory, JobPriority
+from datetime import datetime, timezone
+from .registry import JobRegistry, JobCategory, JobPriority, CATEGORY_TITLES
 
-# Import your job functions
-# from content.reply_handler import reply_to_comments
-from jobs.maintenance import run_weekly_maintenance_job
-from jobs.data_ingestion import run_headline_ingestion_job
-from jobs.market_summary import run_market_summary_job
-from jobs.news_recap import run_news_thread_job
-from jobs.opinion_thread import run_opinion_thread_job
-from jobs.random_post import run_random_post_job
-from jobs.ta_thread import run_ta_thread_job
-from jobs.explainer_thread import run_explainer_thread_job
-from jobs.ta_article import run_ta_article_job
+# Job functions are registered as 'module:function' paths and imported on
+# first run, so scheduler startup doesn't load every job's dependencies
+# Not registered: "content.reply_handler:reply_to_comments"
 
 logger = logging.getLogger(__name__)
 
+# Token analyzed on each weekday, indexed by weekday(): Monday=0 ... Friday=4
+TA_THREAD_TOKENS = ("BTC", "ETH", "SOL", "XRP", "DOGE")
+
 def run_daily_ta_thread_wrapper():
     """Determines which token to analyze based on the day of the week."""
-    # Monday=0, Tuesday=1, ..., Friday=4
-    weekday = datetime.utcnow().weekday()
-    token_map = {
-        0: "BTC", # Monday
-        1: "ETH", # Tuesday
-        2: "SOL", # Wednesday
-        3: "XRP", # Thursday
-        4: "DOGE"  # Friday
-    }
-    token_to_analyze = token_map.get(weekday)
-    if token_to_analyze:
-        run_ta_thread_job(token_to_analyze)
+    from jobs.ta_thread import run_ta_thread_job
+    
+    weekday = datetime.now(timezone.utc).weekday()
+    if weekday < len(TA_THREAD_TOKENS):
+        run_ta_thread_job(TA_THREAD_TOKENS[weekday])
     else:
         logging.info("Not a weekday for TA threads. Skipping.")
 
@@ -43,7 +31,7 @@ def setup_all_jobs(job_registry: JobRegistry):
     # ===== DATA INGESTION JOBS =====
     job_registry.register_job(
         name="fetch_headlines",
-        func=run_headline_ingestion_job,
+        func="jobs.data_ingestion:run_headline_ingestion_job",
         schedule_config={'type': 'hourly', 'minute': ':55'},
         category=JobCategory.DATA_INGESTION,
         priority=JobPriority.CRITICAL,
@@ -55,7 +43,7 @@ def setup_all_jobs(job_registry: JobRegistry):
     # Daily news thread
     job_registry.register_job(
         name="news_thread",
-        func=run_news_thread_job,
+        func="jobs.news_recap:run_news_thread_job",
         schedule_config={'type': 'daily', 'time': '13:00'},
         category=JobCategory.SOCIAL_POSTING,
         priority=JobPriority.HIGH,
@@ -66,7 +54,7 @@ def setup_all_jobs(job_registry: JobRegistry):
     # Daily market summary
     job_registry.register_job(
         name="market_summary",
-        func=run_market_summary_job,
+        func="jobs.market_summary:run_market_summary_job",
         schedule_config={'type': 'daily', 'time': '14:00'},
         category=JobCategory.SOCIAL_POSTING,
         priority=JobPriority.HIGH,
@@ -87,7 +75,7 @@ def setup_all_jobs(job_registry: JobRegistry):
     for day in ['saturday', 'sunday', 'monday', 'tuesday', 'wednesday', 'thursday']:
         job_registry.register_job(
             name=f"opinion_thread_{day}",
-            func=run_opinion_thread_job,
+            func="jobs.opinion_thread:run_opinion_thread_job",
             schedule_config={'type': 'weekly', 'day': day, 'time': '23:45'}, # Uses the supported 'weekly' type
             category=JobCategory.SOCIAL_POSTING,
             priority=JobPriority.MEDIUM,
@@ -97,7 +85,7 @@ def setup_all_jobs(job_registry: JobRegistry):
     # Hunter Explainer on Fridays
     job_registry.register_job(
         name="explainer_thread_weekly", # Renamed from "substack_explainer" for clarity
-        func=run_explainer_thread_job,
+        func="jobs.explainer_thread:run_explainer_thread_job",
         schedule_config={'type': 'weekly', 'day': 'friday', 'time': '23:45'},
         category=JobCategory.CONTENT_GENERATION,
         priority=JobPriority.MEDIUM,
@@ -109,7 +97,7 @@ def setup_all_jobs(job_registry: JobRegistry):
     for day in ['saturday', 'sunday']:
         job_registry.register_job(
             name=f"random_post_{day}_morning",
-            func=run_random_post_job,
+            func="jobs.random_post:run_random_post_job",
             schedule_config={'type': 'weekly', 'day': day, 'time': '10:00'}, # Uses 'weekly' type
             category=JobCategory.SOCIAL_POSTING,
             priority=JobPriority.LOW,
@@ -117,7 +105,7 @@ def setup_all_jobs(job_registry: JobRegistry):
         )
         job_registry.register_job(
             name=f"random_post_{day}_afternoon",
-            func=run_random_post_job,
+            func="jobs.random_post:run_random_post_job",
             schedule_config={'type': 'weekly', 'day': day, 'time': '17:00'}, # Uses 'weekly' type
             category=JobCategory.SOCIAL_POSTING,
             priority=JobPriority.LOW,
@@ -125,7 +113,7 @@ def setup_all_jobs(job_registry: JobRegistry):
         )
         job_registry.register_job(
             name=f"random_post_{day}_evening",
-            func=run_random_post_job,
+            func="jobs.random_post:run_random_post_job",
             schedule_config={'type': 'weekly', 'day': day, 'time': '21:00'}, # Uses 'weekly' type
             category=JobCategory.SOCIAL_POSTING,
             priority=JobPriority.LOW,
@@ -137,7 +125,7 @@ def setup_all_jobs(job_registry: JobRegistry):
     # Weekly TA Substack article (Sundays)
     job_registry.register_job(
         name="ta_substack_article",
-        func=run_ta_article_job,
+        func="jobs.ta_article:run_ta_article_job",
         schedule_config={'type': 'weekly', 'day': 'sunday', 'time': '18:00'},
         category=JobCategory.CONTENT_GENERATION,
         priority=JobPriority.MEDIUM,
@@ -149,7 +137,7 @@ def setup_all_jobs(job_registry: JobRegistry):
     # Weekly log rotation (Sundays)
     job_registry.register_job(
         name="log_rotation",
-        func=run_weekly_maintenance_job,
+        func="jobs.maintenance:run_weekly_maintenance_job",
         schedule_config={'type': 'weekly', 'day': 'sunday', 'time': '23:50'},
         category=JobCategory.MAINTENANCE,
         priority=JobPriority.LOW,
@@ -162,6 +150,8 @@ def setup_all_jobs(job_registry: JobRegistry):
     # Note: This will be added separately in the main scheduler
     # since it uses a different function from the scheduler module
     
+    # Fail at startup on a missing or cyclic dependency, not at the first missed run
+    job_registry.finalize()
     logger.info("✅ All jobs registered successfully")
     
     # Print summary by category
@@ -170,59 +160,57 @@ def setup_all_jobs(job_registry: JobRegistry):
         if jobs:
             logger.info(f"📁 {category.value.title()}: {len(jobs)} jobs - {', '.join(jobs)}")
 
-def print_job_summary(job_registry: JobRegistry):
-    """FIXED: Print a nice summary of all registered jobs using logger instead of print"""
-    logger.info("="*80)
-    logger.info("🔧 JOB REGISTRY SUMMARY")
-    logger.info("="*80)
+PRIORITY_EMOJI = {
+    JobPriority.CRITICAL: "🔴",
+    JobPriority.HIGH: "🟡", 
+    JobPriority.MEDIUM: "🟢",
+    JobPriority.LOW: "🔵"
+}
+
+# (registry id, registry version, summary lines) from the last print_job_summary call
+_summary_cache = (None, None, None)
+
+def _build_job_summary(job_registry: JobRegistry) -> list:
+    lines = ["="*80, "🔧 JOB REGISTRY SUMMARY", "="*80]
     
     total_jobs = len(job_registry.jobs)
-    enabled_jobs = sum(1 for job in job_registry.jobs.values() if job['enabled'])
+    enabled_jobs = job_registry.enabled_count
     
-    logger.info(f"📊 Total Jobs: {total_jobs} | Enabled: {enabled_jobs} | Disabled: {total_jobs - enabled_jobs}")
+    lines.append(f"📊 Total Jobs: {total_jobs} | Enabled: {enabled_jobs} | Disabled: {total_jobs - enabled_jobs}")
     
     for category in JobCategory:
         jobs = job_registry.get_category_jobs(category)
         if not jobs:
             continue
             
-        logger.info(f"📁 {category.value.upper().replace('_', ' ')}")
-        logger.info("-" * 40)
+        lines.append(f"📁 {CATEGORY_TITLES[category]}")
+        lines.append("-" * 40)
         
         for job_name in jobs:
             job_info = job_registry.jobs[job_name]
-            schedule = job_info['schedule_config']
             status = "✅" if job_info['enabled'] else "⏸️"
             
-            # Format schedule info
-            if schedule['type'] == 'hourly':
-                schedule_str = f"Every hour at {schedule['minute']}"
-            elif schedule['type'] == 'daily':
-                schedule_str = f"Daily at {schedule['time']}"
-            elif schedule['type'] == 'weekly':
-                schedule_str = f"Every {schedule['day']} at {schedule['time']}"
-            elif schedule['type'] == 'weekdays':
-                schedule_str = f"Weekdays at {schedule['time']}"
-            elif schedule['type'] == 'interval':
-                schedule_str = f"Every {schedule['value']} {schedule['unit']}"
-            else:
-                schedule_str = str(schedule)
-            
-            priority_emoji = {
-                JobPriority.CRITICAL: "🔴",
-                JobPriority.HIGH: "🟡", 
-                JobPriority.MEDIUM: "🟢",
-                JobPriority.LOW: "🔵"
-            }
-            
-            logger.info(f"  {status} {job_name}")
-            logger.info(f"     {priority_emoji[job_info['priority']]} {schedule_str}")
+            lines.append(f"  {status} {job_name}")
+            lines.append(f"     {PRIORITY_EMOJI[job_info['priority']]} {job_info['schedule_str']}")
             if job_info['description']:
-                logger.info(f"     💬 {job_info['description']}")
+                lines.append(f"     💬 {job_info['description']}")
             if job_info['dependencies']:
-                logger.info(f"     🔗 Depends on: {', '.join(job_info['dependencies'])}")
+                lines.append(f"     🔗 Depends on: {', '.join(job_info['dependencies'])}")
     
-    logger.info("="*80)
+    lines.append("="*80)
+    return lines
+
+def print_job_summary(job_registry: JobRegistry):
+    """FIXED: Print a nice summary of all registered jobs using logger instead of print"""
+    global _summary_cache
+    registry_id, version, lines = _summary_cache
+    if registry_id != id(job_registry) or version != job_registry.version:
+        # Rebuilt only after jobs are (un)registered, enabled or disabled
+        lines = _build_job_summary(job_registry)
+        _summary_cache = (id(job_registry), job_registry.version, lines)
+    
+    for line in lines:
+        logger.info(line)
 
 # Example usage for testing
 if __name__ == "__main__":
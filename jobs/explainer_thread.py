@@ -2,40 +2,23 @@
 
 import logging
 import os
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-from services.database_service import DatabaseService
+from services.database_service import get_database_service
 from services.hunter_ai_service import get_hunter_ai_service
+from utils.hunter_poses import pose_exists
 from utils.x_post import post_thread, upload_media
-from utils.text_utils import slugify
+from utils.text_utils import slugify, utc_date_str
 from utils.notion_logger import log_article_to_notion, update_notion_article_with_tweet_url
 from utils.url_helpers import get_article_file_path, get_article_web_url, get_tweet_url, get_image_url
 
 logger = logging.getLogger(__name__)
 
-def run_explainer_thread_job():
-    """
-    Generates a detailed explainer article with Hunter's voice, saves it locally, 
-    logs it to Notion, and posts a promotional thread on X that links to it.
-    """
-    logger.info("Starting Full Explainer Job (Article + Thread)...")
-    db_service = DatabaseService()
-    hunter_ai = get_hunter_ai_service()
-
-    try:
-        # 1. Get top headline from the database
-        headline_entry = db_service.get_top_headline(days=7)
-        if not headline_entry:
-            logger.warning("No suitable headline found for the explainer. Skipping.")
-            return
-
-        topic = headline_entry["headline"]
-        headline_id = headline_entry["id"]
-        logger.info(f"Selected top headline (ID: {headline_id}): '{topic}'")
+# Hunter's explaining pose; looked up in the shared pose manifest each run
+EXPLAINER_IMAGE_PATH = "/app/content/assets/hunter_poses/explaining.png"
 
-        # 2. Generate the core article content
-        # Note: Hunter persona is now handled by hunter_ai_service automatically
-        article_prompt = f"""
+# Prompt templates; only {topic} is filled in per run
+ARTICLE_PROMPT_TEMPLATE = """
 Write a 1,000-1,500 word article on: "{topic}"
 
 Your analysis must serve three audiences:
@@ -53,18 +36,29 @@ Your analysis must serve three audiences:
 
 Use emojis strategically and inject personality throughout.
 """
-        
-        article_body = hunter_ai.generate_analysis(article_prompt, max_tokens=3500)
 
-        if not article_body:
-            logger.error("AI failed to generate article content. Skipping job.")
-            return
-        
-        # 3. Format the full article with header, image, and footer
-        article_title = f"Hunter Explains: {topic}"
-        hunter_headshot_url = get_image_url("hunter_headshot.png")
-        
-        common_footer = """
+THREAD_PROMPT_TEMPLATE = """
+Topic: {topic}
+
+Create a 3-part Twitter thread called 'Hunter Explains' about this topic.
+Make it simple, clever, and accessible. Use emojis and bold takes.
+Each tweet must be under 280 characters.
+Do NOT include headers, links, or dates - they will be added separately.
+"""
+
+# One call for both: the article prompt plus the thread, returned as a JSON object
+COMBINED_PROMPT_TEMPLATE = ARTICLE_PROMPT_TEMPLATE + """
+Then write a 3-part Twitter thread called 'Hunter Explains' promoting the article.
+Make it simple, clever, and accessible. Use emojis and bold takes.
+Each tweet must be under 280 characters.
+Do NOT include headers, links, or dates in the tweets - they will be added separately.
+
+Respond ONLY with a JSON object in this exact format:
+{{"article": "<the full article in markdown>", "thread": ["<tweet 1>", "<tweet 2>", "<tweet 3>"]}}
+"""
+
+# Static footer appended to every explainer article
+ARTICLE_FOOTER = """
 ---
 
 *Follow [@Web3_Dobie](https://twitter.com/Web3_Dobie) for more crypto insights and subscribe for weekly deep dives!*
@@ -74,48 +68,115 @@ Use emojis strategically and inject personality throughout.
 Until next week,
 Hunter the Web3 Dobie
 """
+
+
+def _generate_article_and_thread(hunter_ai, topic: str):
+    """
+    Asks for the article and its 3-part thread in a single structured AI call.
+    Returns (article_body, thread_parts), or (None, None) if the response is unusable.
+    """
+    prompt = COMBINED_PROMPT_TEMPLATE.format(topic=topic)
+    try:
+        data = hunter_ai.generate_structured(prompt, max_tokens=4000)
+    except Exception as e:
+        logger.warning(f"Combined article/thread generation failed, using separate calls: {e}")
+        return None, None
+
+    article = data.get("article") if data else None
+    thread = data.get("thread") if data else None
+    if (not isinstance(article, str) or not article.strip()
+            or not isinstance(thread, list) or len(thread) < 3
+            or not all(isinstance(part, str) and part.strip() for part in thread)):
+        logger.warning("Combined article/thread response was incomplete, using separate calls.")
+        return None, None
+    return article.strip(), [part.strip() for part in thread]
+
+
+def run_explainer_thread_job():
+    """
+    Generates a detailed explainer article with Hunter's voice, saves it locally, 
+    logs it to Notion, and posts a promotional thread on X that links to it.
+    """
+    logger.info("Starting Full Explainer Job (Article + Thread)...")
+    db_service = get_database_service()
+    hunter_ai = get_hunter_ai_service()
+
+    try:
+        # 1. Get top headline from the database
+        headline_entry = db_service.get_top_headline(days=7)
+        if not headline_entry:
+            logger.warning("No suitable headline found for the explainer. Skipping.")
+            return
+
+        topic = headline_entry["headline"]
+        headline_id = headline_entry["id"]
+        logger.info(f"Selected top headline (ID: {headline_id}): '{topic}'")
+
+        # 2. Generate the article and its thread in one call; fall back to
+        #    separate calls if the combined response doesn't parse
+        # Note: Hunter persona is now handled by hunter_ai_service automatically
+        article_body, thread_parts = _generate_article_and_thread(hunter_ai, topic)
+        if article_body is None:
+            article_prompt = ARTICLE_PROMPT_TEMPLATE.format(topic=topic)
+            article_body = hunter_ai.generate_analysis(article_prompt, max_tokens=3500)
+
+        if not article_body:
+            logger.error("AI failed to generate article content. Skipping job.")
+            return
+        
+        # 3. Format the full article with header, image, and footer
+        article_title = f"Hunter Explains: {topic}"
+        hunter_headshot_url = get_image_url("hunter_headshot.png")
         
-        final_article_content = f"![Hunter the Dobie]({hunter_headshot_url})\n\n# {article_title}\n\n{article_body}\n\n{common_footer}"
+        # Kept as parts: written straight to the file, joined only for the DB log
+        article_parts = [
+            f"![Hunter the Dobie]({hunter_headshot_url})\n\n",
+            f"# {article_title}\n\n",
+            article_body,
+            "\n\n",
+            ARTICLE_FOOTER,
+        ]
         
         # 4. Save the final article to a local file
-        today_str = datetime.utcnow().strftime("%Y-%m-%d")
+        today_str = utc_date_str()
         slug = slugify(topic)
         file_name = f"{today_str}_{slug}.md"
         article_path = f"/app/posts/explainer/{file_name}"
         os.makedirs(os.path.dirname(article_path), exist_ok=True)
         
         with open(article_path, 'w', encoding='utf-8') as f:
-            f.write(final_article_content)
+            f.writelines(article_parts)
         logger.info(f"Article saved locally to: {article_path}")
 
         # 5. Construct the API path where the frontend will fetch the markdown file
         article_file_path = get_article_file_path("explainer", file_name)
         logger.info(f"Article file path for Notion: {article_file_path}")
 
-        # 6. Log the article to Notion to get a Page ID
-        notion_page_id = log_article_to_notion(
-            headline=article_title,
-            file_url=article_file_path,  # RENAMED: This is the API path, not a public URL
-            tags=["explainer", "crypto", "education"],
-            category="Explainer",
-            summary=f"Hunter breaks down '{topic}' with wit and insight."
-        )
-        
-        # 7. Construct the public URL that users will click in the tweet
-        public_article_url = get_article_web_url(notion_page_id) if notion_page_id else article_file_path
-        logger.info(f"Public article URL for tweet: {public_article_url}")
+        # 6. Log the article to Notion and upload the thread image in the background;
+        #    neither depends on the thread text, so both overlap the AI call below
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            notion_future = executor.submit(
+                log_article_to_notion,
+                headline=article_title,
+                file_url=article_file_path,  # RENAMED: This is the API path, not a public URL
+                tags=["explainer", "crypto", "education"],
+                category="Explainer",
+                summary=f"Hunter breaks down '{topic}' with wit and insight."
+            )
+            # Upload Hunter's explaining image
+            media_future = executor.submit(upload_media, EXPLAINER_IMAGE_PATH) if pose_exists(EXPLAINER_IMAGE_PATH) else None
 
-        # 8. Generate and post the promotional thread
-        thread_prompt = f"""
-Topic: {topic}
+            # 7. Generate the promotional thread (unless the combined call produced it)
+            if thread_parts is None:
+                thread_prompt = THREAD_PROMPT_TEMPLATE.format(topic=topic)
+                thread_parts = hunter_ai.generate_thread(thread_prompt, parts=3)
 
-Create a 3-part Twitter thread called 'Hunter Explains' about this topic.
-Make it simple, clever, and accessible. Use emojis and bold takes.
-Each tweet must be under 280 characters.
-Do NOT include headers, links, or dates - they will be added separately.
-"""
-        
-        thread_parts = hunter_ai.generate_thread(thread_prompt, parts=3)
+            notion_page_id = notion_future.result()
+            media_id = media_future.result() if media_future else None
+
+        # 8. Construct the public URL that users will click in the tweet
+        public_article_url = get_article_web_url(notion_page_id) if notion_page_id else article_file_path
+        logger.info(f"Public article URL for tweet: {public_article_url}")
 
         if not thread_parts or len(thread_parts) < 3:
             logger.warning("AI returned insufficient parts for the thread. Skipping post.")
@@ -126,10 +187,6 @@ Do NOT include headers, links, or dates - they will be added separately.
         thread_parts[0] = header + thread_parts[0].lstrip()
         thread_parts[-1] = thread_parts[-1].strip() + f"\n\nRead the full deep dive: {public_article_url}"
 
-        # Upload Hunter's explaining image
-        img_path = "/app/content/assets/hunter_poses/explaining.png"
-        media_id = upload_media(img_path) if os.path.exists(img_path) else None
-        
         post_result = post_thread(thread_parts, category="explainer", media_id_first=media_id)
 
         # 9. Log everything and update Notion with the tweet URL
@@ -143,7 +200,7 @@ Do NOT include headers, links, or dates - they will be added separately.
             db_service.log_content(
                 content_type="explainer_thread", 
                 tweet_id=final_tweet_id,
-                details=final_article_content, 
+                details="".join(article_parts), 
                 headline_id=headline_id,
                 ai_provider=hunter_ai.provider.value, 
                 notion_url=public_article_url  # RENAMED: This is the public URL
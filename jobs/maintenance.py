@@ -1,12 +1,15 @@
 # jobs/maintenance.py
 
+import errno
 import logging
 import os
 import shutil
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-from services.database_service import DatabaseService
+from services.database_service import get_database_service
 from utils.config import LOG_DIR, BACKUP_DIR
+from utils.tg_notifier import send_telegram_message
+from utils.text_utils import utc_date_str
 
 logger = logging.getLogger(__name__)
 
@@ -21,12 +24,19 @@ def _rotate_log_file(log_name: str) -> bool:
         return False
 
     try:
-        date_str = datetime.utcnow().strftime("%Y-%m-%d")
+        date_str = utc_date_str()
         backup_subdir = os.path.join(BACKUP_DIR, f"{log_name}_backup")
         os.makedirs(backup_subdir, exist_ok=True)
         
         dst_path = os.path.join(backup_subdir, f"{log_name}.{date_str}")
-        shutil.move(src_path, dst_path)
+        try:
+            # Same filesystem: a metadata-only rename, no data copied
+            os.rename(src_path, dst_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # Different filesystem: hardlinks can't cross devices either, so copy
+            shutil.move(src_path, dst_path)
         logger.info(f"Rotated log file: {log_name} -> {dst_path}")
         return True
     except Exception as e:
@@ -40,7 +50,7 @@ def run_weekly_maintenance_job():
     This replaces the old rotate_logs.py script.
     """
     logger.info("🛠️ Starting Weekly Maintenance Job...")
-    db_service = DatabaseService()
+    db_service = get_database_service()
     
     # Track purge results for summary
     purge_results = {}
@@ -57,14 +67,11 @@ def run_weekly_maintenance_job():
             'ta_data': 365
         }
         
-        # Execute purges and collect results
+        # Execute all purges in one transaction and collect results
+        deleted_counts = db_service.purge_old_records_batch(retention_policies)
         for table_name, days_to_keep in retention_policies.items():
-            deleted_count = db_service.purge_old_records(
-                table_name=table_name, 
-                days_to_keep=days_to_keep
-            )
             purge_results[table_name] = {
-                'deleted': deleted_count,
+                'deleted': deleted_counts.get(table_name, 0),
                 'retention_days': days_to_keep
             }
         
@@ -78,10 +85,9 @@ def run_weekly_maintenance_job():
             "ai_service.log",
         ]
         
-        rotated_count = 0
-        for log_file in current_log_files:
-            if _rotate_log_file(log_file):
-                rotated_count += 1
+        # Files are independent, so rotate them concurrently (cross-device moves copy)
+        with ThreadPoolExecutor(max_workers=len(current_log_files)) as executor:
+            rotated_count = sum(executor.map(_rotate_log_file, current_log_files))
         
         # 3. Generate summary
         total_deleted = sum(result['deleted'] for result in purge_results.values())
@@ -104,7 +110,6 @@ def run_weekly_maintenance_job():
         logger.info(summary_text)
         
         # Send Telegram notification with summary
-        from utils.tg_notifier import send_telegram_message
         send_telegram_message(
             f"✅ Weekly Maintenance Complete\n\n{summary_text}",
             parse_mode=None
@@ -117,7 +122,6 @@ def run_weekly_maintenance_job():
         logger.error(error_msg, exc_info=True)
         
         # Send error notification
-        from utils.tg_notifier import send_telegram_message
         send_telegram_message(error_msg, parse_mode=None)
         
         raise
\ No newline at end of file
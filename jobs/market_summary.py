@@ -2,36 +2,109 @@
 
 import logging
 import os
+import time
 import requests
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
-# No longer needs DatabaseService
 from services.ai_service import get_ai_service
+from services.database_service import get_database_service
+from utils import fastjson
+from utils.config import DATA_DIR
+from utils.http_session import coingecko_get
+from utils.hunter_poses import pose_exists
 from utils.x_post import post_thread, upload_media
+from utils.text_utils import utc_date_str
 
 logger = logging.getLogger(__name__)
 
-# --- Helper function for this job ---
+# Last CoinGecko response, reused within the TTL (job retries) and as a
+# stale fallback when the API is rate limiting or down
+PRICE_CACHE_FILE = os.path.join(DATA_DIR, "market_summary_prices.json")
+PRICE_CACHE_TTL = 120  # seconds, roughly CoinGecko's price refresh cadence
+PRICE_CACHE_MAX_STALE = 3600  # never post prices older than this, even on API errors
+
+# Hunter's pose for the leading token, by market direction
+TOKEN_IMAGES = {
+    "BTC": {"up": "/app/content/assets/hunter_poses/BTC_up.png", "down": "/app/content/assets/hunter_poses/BTC_down.png"},
+    "ETH": {"up": "/app/content/assets/hunter_poses/ETH_up.png", "down": "/app/content/assets/hunter_poses/ETH_down.png"},
+    "SOL": {"up": "/app/content/assets/hunter_poses/SOL_up.png", "down": "/app/content/assets/hunter_poses/SOL_down.png"},
+    "XRP": {"up": "/app/content/assets/hunter_poses/XRP_up.png", "down": "/app/content/assets/hunter_poses/XRP_down.png"},
+    "DOGE": {"up": "/app/content/assets/hunter_poses/DOGE_up.png", "down": "/app/content/assets/hunter_poses/DOGE_down.png"}
+}
+
+# First tweet of the thread: date header + the AI's first part
+THREAD_HEADER = "Daily Dobie Market Update [{date}] 📅\n\n{text}"
+
+# One "$BTC: $64,000.00 (+1.23%)" entry of the AI prompt
+_format_bullet = "${}: ${:,.2f} ({:+.2f}%)".format
+
+# --- Helper functions for this job ---
+def _resolve_pose(ticker: str, direction: str):
+    """Image path for ticker/direction if the asset exists, otherwise None."""
+    image_path = TOKEN_IMAGES.get(ticker, {}).get(direction)
+    return image_path if pose_exists(image_path) else None
+
+
+def _load_price_cache() -> dict:
+    try:
+        with open(PRICE_CACHE_FILE, 'rb') as f:
+            return fastjson.loads(f.read())
+    except (FileNotFoundError, ValueError):  # ValueError covers both parsers' decode errors
+        return {}
+
+def _save_price_cache(cache: dict):
+    try:
+        tmp_path = PRICE_CACHE_FILE + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(fastjson.dumps(cache))
+        os.replace(tmp_path, PRICE_CACHE_FILE)
+    except OSError as e:
+        logger.warning(f"Could not save market price cache: {e}")
+
+def _fetch_prices(ids: str) -> list:
+    """
+    CoinGecko market data (price, 24h change, volume, market cap) for ids in one
+    call, served from the disk cache while it is fresh.
+    """
+    url = f"https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&ids={ids}&price_change_percentage=24h"
+    cache = _load_price_cache()
+    age = time.time() - cache.get("ts", 0)
+    cached_data = cache.get("data") if cache.get("url") == url and age < PRICE_CACHE_MAX_STALE else None
+    if cached_data and age < PRICE_CACHE_TTL:
+        logger.info("Using cached market prices")
+        return cached_data
+
+    try:
+        response = coingecko_get(url, timeout=10)
+        response.raise_for_status()
+        data = fastjson.loads(response.content)
+    except (requests.RequestException, ValueError) as e:  # ValueError: malformed JSON body
+        if not cached_data:
+            raise
+        logger.warning(f"Price fetch failed ({e}), using cached prices from {age / 60:.0f} minutes ago")
+        return cached_data
+
+    _save_price_cache({"url": url, "ts": time.time(), "data": data})
+    return data
+
 def _get_market_summary_data():
-    """Fetches simple price and 24h change from a live API."""
+    """Fetches price and 24h change from a live API."""
     tokens = {"bitcoin": "BTC", "ethereum": "ETH", "solana": "SOL", "ripple": "XRP", "dogecoin": "DOGE"}
     try:
         ids = ",".join(tokens.keys())
-        url = f"https://api.coingecko.com/api/v3/simple/price?ids={ids}&vs_currencies=usd&include_24hr_change=true"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        markets = {coin.get("id"): coin for coin in _fetch_prices(ids)}
 
         results = []
         for name, ticker in tokens.items():
-            info = data.get(name, {})
-            if "usd" in info and "usd_24h_change" in info:
-                results.append({"ticker": ticker, "price": info["usd"], "change": info["usd_24h_change"]})
+            info = markets.get(name, {})
+            if info.get("current_price") is not None and info.get("price_change_percentage_24h") is not None:
+                results.append({"ticker": ticker, "price": info["current_price"], "change": info["price_change_percentage_24h"]})
         
         if len(results) < 3: return []
         
         all_negative = all(t['change'] < 0 for t in results)
-        results.sort(key=lambda x: x['change'], reverse=not all_negative)
+        results.sort(key=itemgetter('change'), reverse=not all_negative)
         return results
     except Exception as e:
         logger.error(f"Error fetching market summary prices: {e}")
@@ -41,10 +114,11 @@ def _get_market_summary_data():
 def run_market_summary_job():
     """
     Generates and posts a daily market summary thread using live data.
-    This job does NOT write to the database.
+    Only the posted thread is logged to the database (content_log).
     """
     logger.info("📈 Starting Market Summary Job...")
     ai_service = get_ai_service()
+    db_service = get_database_service()
 
     try:
         # 1. Fetch live market data
@@ -54,7 +128,7 @@ def run_market_summary_job():
             return
 
         # 2. Generate thread content using the AI Service
-        bullet_points = " ".join(f"${t['ticker']}: ${t['price']:,.2f} ({t['change']:+.2f}%)" for t in tokens_data)
+        bullet_points = " ".join(_format_bullet(t['ticker'], t['price'], t['change']) for t in tokens_data)
         task_rules = """
 **TASK:** Write a clever, insightful tweet for each token in the data block below.
 **RULES:**
@@ -63,34 +137,40 @@ def run_market_summary_job():
 - End each tweet with '— Hunter 🐾'.
 - Separate each tweet with '---'.
 """
-        thread_parts = ai_service.generate_thread(
+        # The pose only depends on the prices, so upload it while the AI writes
+        leading_token = tokens_data[0]['ticker']
+        # Sorted best-first unless every token is down (then worst-first), so the
+        # leading token's change alone tells whether the whole market is down
+        all_negative = tokens_data[0]['change'] < 0
+        image_type = "down" if all_negative else "up"
+        image_path = _resolve_pose(leading_token, image_type)
+
+        # Parts are streamed: the first tweet goes out while the AI is still
+        # writing the rest, and each later part is posted as soon as it's complete
+        streamed_parts = ai_service.stream_thread(
             prompt=bullet_points, system_instruction=task_rules, parts=len(tokens_data), max_tokens=3000
         )
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            media_future = executor.submit(upload_media, image_path) if image_path else None
+            first_part = next(streamed_parts, None)
+            media_id = media_future.result() if media_future else None
 
-        if not thread_parts or len(thread_parts) < len(tokens_data):
-            logger.warning("AI returned insufficient parts for the market summary. Skipping.")
+        if not first_part:
+            logger.warning("AI returned no content for the market summary. Skipping.")
             return
 
         # 3. Prepare and post the thread
-        today = datetime.utcnow().strftime("%Y-%m-%d")
-        header = f"Daily Dobie Market Update [{today}] 📅\n\n"
-        thread_parts[0] = header + thread_parts[0]
+        thread_parts = [THREAD_HEADER.format_map({"date": utc_date_str(), "text": first_part})]
 
-        leading_token = tokens_data[0]['ticker']
-        all_negative = all(t['change'] < 0 for t in tokens_data)
-        image_type = "down" if all_negative else "up"
-        
-        token_images = {
-            "BTC": {"up": "/app/content/assets/hunter_poses/BTC_up.png", "down": "/app/content/assets/hunter_poses/BTC_down.png"},
-            "ETH": {"up": "/app/content/assets/hunter_poses/ETH_up.png", "down": "/app/content/assets/hunter_poses/ETH_down.png"},
-            "SOL": {"up": "/app/content/assets/hunter_poses/SOL_up.png", "down": "/app/content/assets/hunter_poses/SOL_down.png"},
-            "XRP": {"up": "/app/content/assets/hunter_poses/XRP_up.png", "down": "/app/content/assets/hunter_poses/XRP_down.png"},
-            "DOGE": {"up": "/app/content/assets/hunter_poses/DOGE_up.png", "down": "/app/content/assets/hunter_poses/DOGE_down.png"}
-        }
-        image_path = token_images.get(leading_token, {}).get(image_type)
-        media_id = upload_media(image_path) if image_path and os.path.exists(image_path) else None
-
-        post_result = post_thread(thread_parts, category="market_summary", media_id_first=media_id)
+        def _collect_parts():
+            yield thread_parts[0]
+            for part in streamed_parts:
+                thread_parts.append(part)
+                yield part
+
+        post_result = post_thread(_collect_parts(), category="market_summary", media_id_first=media_id)
+        if len(thread_parts) < len(tokens_data):
+            logger.warning(f"AI returned {len(thread_parts)} of {len(tokens_data)} market summary parts.")
         
         # Database logging
         if post_result and post_result.get("error") is None:
@@ -106,12 +186,7 @@ def run_market_summary_job():
                 ai_provider=ai_service.provider.value
             )
             
-            # Decrement rate limiter for each tweet in the thread
-            from utils.rate_limit_manager import decrement_rate_limit_counter
-            for i in range(len(thread_parts)):
-                decrement_rate_limit_counter()
-            
-            logger.info(f"✅ Logged market summary and decremented rate limiter by {len(thread_parts)}")
+            logger.info(f"✅ Logged market summary thread of {len(thread_parts)} parts")
         else:
             logger.error(f"Failed to post market summary thread. Error: {post_result.get('error')}")
 
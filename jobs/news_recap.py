@@ -1,24 +1,26 @@
 # Hunter-Agent/jobs/news_recap.py
 
 import logging
-import os
 import re  # ADDED
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-from services.database_service import DatabaseService
+from services.database_service import get_database_service
 from services.hunter_ai_service import get_hunter_ai_service  # CHANGED
 from utils.x_post import post_thread, upload_media
-from utils.text_utils import insert_cashtags, insert_mentions
+from utils.text_utils import insert_cashtags_and_mentions, utc_date_str
 
 logger = logging.getLogger(__name__)
 
+# First tweet of the thread: date header + the AI's first part
+THREAD_HEADER = "Daily Dobie Headlines [{date}] 📰\n\n{text}"
+
 def run_news_thread_job():
     """
     Generates and posts a daily news recap thread based on the top headlines
     from the database.
     """
     logger.info("📰 Starting Daily News Recap Job...")
-    db_service = DatabaseService()
+    db_service = get_database_service()
     hunter_ai = get_hunter_ai_service()  # CHANGED
 
     try:
@@ -32,8 +34,7 @@ def run_news_thread_job():
         logger.info(f"Selected top 3 headlines for the thread.")
         
         # 2. Generate thread content
-        prompt_lines = [f"- {h['headline']}" for h in top_headlines]
-        headlines_text = "\n".join(prompt_lines)
+        headlines_text = "\n".join("- " + h['headline'] for h in top_headlines)
         
         task_rules = """
 **TASK:** Write a 3-part tweet thread summarizing the key crypto headlines provided.
@@ -44,35 +45,35 @@ def run_news_thread_job():
 - Separate each tweet with '---'.
 - Do NOT number the tweets or add labels like "Tweet 1:", "Tweet 2:", etc.
 """
-        thread_parts = hunter_ai.generate_thread(  # CHANGED
-            prompt=headlines_text,
-            system_instruction=task_rules,
-            parts=3,
-            max_tokens=2048
-        )
+        # Upload the image while the AI writes the thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            media_future = executor.submit(upload_media, "/app/content/assets/hunter_poses/explaining.png")
+            thread_parts = hunter_ai.generate_thread(  # CHANGED
+                prompt=headlines_text,
+                system_instruction=task_rules,
+                parts=3,
+                max_tokens=2048
+            )
+            media_id = media_future.result()
 
         if not thread_parts or len(thread_parts) < 3:
             logger.warning("AI returned insufficient parts for news recap. Skipping.")
             return
 
-        # ADDED: Clean up AI-added labels like "Tweet 1:", "Tweet 2:", etc.
+        # 3. Format the thread in one pass: strip AI-added labels, add the
+        # header to the first part, then cashtags/mentions
+        date_str = utc_date_str()
         cleaned_parts = []
-        for part in thread_parts:
+        for i, part in enumerate(thread_parts):
             cleaned = part.strip()
             # Remove patterns like "Tweet 1:", "Part 1:", "1.", "1)", etc.
             cleaned = re.sub(r'^(Tweet|Part)\s*\d+:\s*', '', cleaned, flags=re.IGNORECASE)
             cleaned = re.sub(r'^\d+[\.)]\s*', '', cleaned)  # Remove "1. " or "1) "
-            cleaned_parts.append(cleaned)
+            if i == 0:
+                cleaned = THREAD_HEADER.format_map({"date": date_str, "text": cleaned})
+            cleaned_parts.append(insert_cashtags_and_mentions(cleaned))
         
         thread_parts = cleaned_parts
-
-        # 3. Format and post the thread
-        date_str = datetime.utcnow().strftime("%Y-%m-%d")
-        header = f"Daily Dobie Headlines [{date_str}] 📰\n\n"
-        thread_parts[0] = header + thread_parts[0]
-        thread_parts = [insert_mentions(insert_cashtags(p)) for p in thread_parts]
-        
-        media_id = upload_media("/app/content/assets/hunter_poses/explaining.png")
         
         post_result = post_thread(thread_parts, category="news_summary", media_id_first=media_id)
         
@@ -92,8 +93,7 @@ def run_news_thread_job():
             )
             
             # Mark all used headlines as used to prevent re-use
-            for headline in top_headlines:
-                db_service.mark_headline_as_used(headline['id'])
+            db_service.mark_headlines_as_used([headline['id'] for headline in top_headlines])
         else:
             logger.error(f"Failed to post news recap thread. Error: {post_result.get('error')}")
 
@@ -1,33 +1,61 @@
 # jobs/opinion_thread.py
 
 import logging
-import os
 import re  # ADDED
+import time
 import requests
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-from services.database_service import DatabaseService
+from services.database_service import get_database_service
 from services.hunter_ai_service import get_hunter_ai_service
+from utils.http_session import get_http_session
 from utils.x_post import post_thread, upload_media
-from utils.text_utils import insert_cashtags, insert_mentions
+from utils.text_utils import insert_cashtags_and_mentions, utc_date_str
 
 logger = logging.getLogger(__name__)
 
+# Cleanup patterns for AI-added preambles and labels, compiled once at import
+_PREAMBLE_RE = re.compile(
+    r'^(Okay,?\s*)?(here\'s|here is)\s*(a|the)\s*\d*-?part\s*.+?(thread|tweet|response).{0,50}?:?\s*',
+    re.IGNORECASE
+)
+_TWEET_LABEL_RE = re.compile(r'^\*?\*?Tweet\s*\d+:?\*?\*?\s*', re.IGNORECASE)
+_PART_LABEL_RE = re.compile(r'^(Part|Thread)\s*\d+:?\s*', re.IGNORECASE)
+_NUMBER_LABEL_RE = re.compile(r'^\d+[\.)]\s*')
+
+# First and last tweets: date header + AI text, AI text + source link
+THREAD_HEADER = "🔥 Hunter Reacts [{date}]\n\n{text}"
+URL_FOOTER = "{text} 🔗 {url}"
+
+# URL -> time of its last successful check; failures are always rechecked
+_URL_OK_TTL = 3600  # seconds
+_url_ok_at = {}
+
 def _is_valid_url(url: str) -> bool:
-    """Checks if a URL is accessible."""
+    """Checks if a URL is accessible (successful checks are reused for an hour)."""
     if not url: return False
+    now = time.monotonic()
+    checked_at = _url_ok_at.get(url)
+    if checked_at is not None and now - checked_at < _URL_OK_TTL:
+        return True
     try:
-        resp = requests.head(url, allow_redirects=True, timeout=5)
-        return resp.status_code == 200
+        resp = get_http_session().head(url, allow_redirects=True, timeout=5)
     except requests.RequestException:
         return False
+    if resp.status_code != 200:
+        return False
+    # Drop expired entries so the map only holds the last hour's headlines
+    for stale_url in [u for u, t in _url_ok_at.items() if now - t >= _URL_OK_TTL]:
+        del _url_ok_at[stale_url]
+    _url_ok_at[url] = now
+    return True
 
 def run_opinion_thread_job():
     """
     Generates and posts a "Hunter Reacts" thread based on the top daily headline.
     """
     logger.info("🔥 Starting 'Hunter Reacts' Opinion Thread Job...")
-    db_service = DatabaseService()
+    db_service = get_database_service()
     hunter_ai = get_hunter_ai_service()
 
     try:
@@ -64,18 +92,35 @@ Create a reaction thread that:
 - Start directly with the content
 """
         
-        thread_parts = hunter_ai.generate_thread(
-            prompt=thread_prompt,
-            parts=3,
-            max_tokens=2000,
-            system_instruction=system_instruction
-        )
+        # Check the headline URL and upload Hunter's waving pose in the background
+        # while the AI writes the thread
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            url_check = executor.submit(_is_valid_url, headline_url)
+            media_future = executor.submit(upload_media, "/app/content/assets/hunter_poses/waving.png")
+            thread_parts = hunter_ai.generate_thread(
+                prompt=thread_prompt,
+                parts=3,
+                max_tokens=2000,
+                system_instruction=system_instruction
+            )
+            url_is_valid = url_check.result()
+            try:
+                media_id = media_future.result()
+            except Exception as e:
+                logger.warning(f"Failed to upload image: {e}")
+                media_id = None
 
         if not thread_parts or len(thread_parts) < 3:
             logger.warning("AI returned insufficient parts for opinion thread. Skipping.")
             return
 
-        # ADDED: Clean up AI-added preambles and labels
+        if not url_is_valid:
+            logger.warning(f"Skipping broken URL for headline: {headline_text}")
+
+        # 3. Format the thread in one pass: strip AI-added preambles and labels,
+        # add the header and (if valid) the link, then cashtags/mentions
+        date_str = utc_date_str()
+        last_index = len(thread_parts) - 1
         cleaned_parts = []
         for i, part in enumerate(thread_parts):
             cleaned = part.strip()
@@ -83,41 +128,22 @@ Create a reaction thread that:
             # Remove common preambles (only from first part)
             if i == 0:
                 # Remove introductory phrases
-                cleaned = re.sub(
-                    r'^(Okay,?\s*)?(here\'s|here is)\s*(a|the)\s*\d*-?part\s*.+?(thread|tweet|response).{0,50}?:?\s*',
-                    '',
-                    cleaned,
-                    flags=re.IGNORECASE
-                )
+                cleaned = _PREAMBLE_RE.sub('', cleaned)
             
             # Remove tweet labels from all parts
-            cleaned = re.sub(r'^\*?\*?Tweet\s*\d+:?\*?\*?\s*', '', cleaned, flags=re.IGNORECASE)
-            cleaned = re.sub(r'^(Part|Thread)\s*\d+:?\s*', '', cleaned, flags=re.IGNORECASE)
-            cleaned = re.sub(r'^\d+[\.)]\s*', '', cleaned)  # Remove "1. " or "1) "
+            cleaned = _TWEET_LABEL_RE.sub('', cleaned)
+            cleaned = _PART_LABEL_RE.sub('', cleaned)
+            cleaned = _NUMBER_LABEL_RE.sub('', cleaned)  # Remove "1. " or "1) "
+            
+            cleaned = cleaned.strip()
             
-            cleaned_parts.append(cleaned.strip())
+            if i == 0:
+                cleaned = THREAD_HEADER.format_map({"date": date_str, "text": cleaned})
+            if i == last_index and url_is_valid:
+                cleaned = URL_FOOTER.format_map({"text": cleaned, "url": headline_url})
+            cleaned_parts.append(insert_cashtags_and_mentions(cleaned))
         
         thread_parts = cleaned_parts
-
-        # 3. Format and post the thread
-        date_str = datetime.utcnow().strftime("%Y-%m-%d")
-        thread_parts[0] = f"🔥 Hunter Reacts [{date_str}]\n\n" + thread_parts[0]
-        
-        # Append URL to the last part if valid
-        if _is_valid_url(headline_url):
-            thread_parts[-1] = thread_parts[-1].strip() + f" 🔗 {headline_url}"
-        else:
-            logger.warning(f"Skipping broken URL for headline: {headline_text}")
-
-        # Final formatting
-        thread_parts = [insert_cashtags(insert_mentions(p)) for p in thread_parts]
-        
-        # Upload Hunter's waving pose
-        try:
-            media_id = upload_media("/app/content/assets/hunter_poses/waving.png")
-        except Exception as e:
-            logger.warning(f"Failed to upload image: {e}")
-            media_id = None
         
         post_result = post_thread(thread_parts, category="news_opinion", media_id_first=media_id)
 
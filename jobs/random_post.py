@@ -1,13 +1,11 @@
 # jobs/random_post_job.py (Simplified: Original Tweets Only)
 
 import logging
-import random
-import os
 
-from services.database_service import DatabaseService
+from services.database_service import get_database_service
 from services.hunter_ai_service import get_hunter_ai_service
 from utils.x_post import post_tweet
-from utils.text_utils import insert_cashtags, insert_mentions
+from utils.text_utils import insert_cashtags_and_mentions
 
 logger = logging.getLogger(__name__)
 
@@ -19,21 +17,18 @@ def run_random_post_job():
     """
     logger.info("🎲 Starting Random Post Job (Original Tweet Only)...")
     
-    db_service = DatabaseService()
+    db_service = get_database_service()
     hunter_ai = get_hunter_ai_service()
 
     try:
         # --- The logic is now only for the "original" tweet path ---
         
-        # Check DB for recent XRP tweet to avoid duplicates
-        xrp_posted_today = db_service.check_if_content_posted_today('xrp_special_tweet')
-        xrp_headline = None
-        
-        if not xrp_posted_today:
-            # Get top XRP headline from the DB
-            xrp_headline = db_service.get_top_xrp_headline_for_today()
-            if xrp_headline:
-                logger.info(f"Using XRP headline from database: {xrp_headline['headline']}")
+        # One query: was an XRP tweet posted today (avoid duplicates), and if not,
+        # the top XRP headline from the DB
+        xrp_context = db_service.get_xrp_context_for_today()
+        xrp_headline = xrp_context["headline"]
+        if xrp_headline:
+            logger.info(f"Using XRP headline from database: {xrp_headline['headline']}")
 
         if xrp_headline:
             input_text = f"News headline: '{xrp_headline['headline']}' URL: {xrp_headline['url']}"
@@ -47,7 +42,7 @@ def run_random_post_job():
         text = hunter_ai.generate_content(input_text=input_text, task_rules=task_rules, max_tokens=280)
         
         if text:
-            text = insert_cashtags(insert_mentions(text))
+            text = insert_cashtags_and_mentions(text)
             post_result = post_tweet(text, category="random")
             
             # Log the post to the database
@@ -1,15 +1,20 @@
 # job_registry.py - Enhanced Job Registry with Categories
+import importlib
+import importlib.util
 import time
 import threading
 import logging
 from datetime import datetime
 from functools import wraps
-from typing import Dict, List, Callable, Optional, Any
+from typing import Dict, List, Callable, Optional, Any, Union
 from enum import Enum
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
 
+# A dependency must have succeeded within this many seconds for its dependents to run
+DEPENDENCY_MAX_AGE = 7200
+
 class JobCategory(Enum):
     """Job categories for organization and monitoring"""
     DATA_INGESTION = "data_ingestion"
@@ -19,6 +24,9 @@ class JobCategory(Enum):
     MAINTENANCE = "maintenance"
     MONITORING = "monitoring"
 
+# Display titles for report headers, e.g. DATA INGESTION
+CATEGORY_TITLES = {category: category.value.upper().replace('_', ' ') for category in JobCategory}
+
 class JobPriority(Enum):
     """Job priority levels"""
     CRITICAL = "critical"
@@ -26,19 +34,108 @@ class JobPriority(Enum):
     MEDIUM = "medium"
     LOW = "low"
 
+def format_schedule(schedule: Dict[str, Any]) -> str:
+    """Human-readable form of a schedule_config dict"""
+    if schedule['type'] == 'hourly':
+        return f"Every hour at {schedule['minute']}"
+    elif schedule['type'] == 'daily':
+        return f"Daily at {schedule['time']}"
+    elif schedule['type'] == 'weekly':
+        return f"Every {schedule['day']} at {schedule['time']}"
+    elif schedule['type'] == 'weekdays':
+        return f"Weekdays at {schedule['time']}"
+    elif schedule['type'] == 'interval':
+        return f"Every {schedule['value']} {schedule['unit']}"
+    return str(schedule)
+
+def lazy_job_function(func_path: str) -> Callable:
+    """
+    Callable for a 'package.module:function' path that imports the module on
+    first call, so registering a job doesn't pull in its dependencies.
+    """
+    module_name, _, attr_name = func_path.partition(':')
+    if not attr_name:
+        raise ValueError(f"Job function path '{func_path}' must look like 'module:function'")
+    # Resolving the module spec is cheap and catches typos at registration time
+    if importlib.util.find_spec(module_name) is None:
+        raise ValueError(f"Job module '{module_name}' not found")
+    
+    resolved = None
+    
+    def lazy_job(*args, **kwargs):
+        nonlocal resolved
+        if resolved is None:
+            resolved = getattr(importlib.import_module(module_name), attr_name)
+        return resolved(*args, **kwargs)
+    
+    lazy_job.__name__ = lazy_job.__qualname__ = attr_name
+    lazy_job.__module__ = module_name
+    return lazy_job
+
+class _JobStats:
+    """
+    Run statistics for one job. The counters change together under the job's
+    own lock; each timestamp is a single attribute store, so dependency checks
+    read them without locking.
+    """
+    FIELDS = ('executions', 'failures', 'last_run', 'last_success', 'last_failure',
+              'total_duration', 'average_duration', 'last_error')
+    __slots__ = FIELDS + ('_lock',)
+    
+    def __init__(self):
+        self.executions = 0
+        self.failures = 0
+        self.last_run = None
+        self.last_success = None
+        self.last_failure = None
+        self.total_duration = 0
+        self.average_duration = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+    
+    def record(self, duration: float, error: Optional[str] = None):
+        """Count one run; error is None for a successful run"""
+        now = time.time()
+        with self._lock:
+            self.executions += 1
+            self.total_duration += duration
+            self.average_duration = self.total_duration / self.executions
+            if error is not None:
+                self.failures += 1
+                self.last_error = error
+                self.last_failure = now
+            else:
+                self.last_success = now
+            self.last_run = now
+    
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {field: getattr(self, field) for field in self.FIELDS}
+
 class JobRegistry:
     """
     Centralized job registry with categorization, proper decoration handling, and monitoring
     """
     def __init__(self):
         self.jobs: Dict[str, Dict] = {}
-        self.job_stats: Dict[str, Dict] = {}
+        self.job_stats: Dict[str, _JobStats] = {}
         self.categories: Dict[JobCategory, List[str]] = {cat: [] for cat in JobCategory}
-        self._stats_lock = threading.RLock()
+        # Topological batches of job names, recomputed only after (un)registration
+        self._parallel_batches: Optional[List[List[str]]] = None
+        # Memoized transitive dependency sets, cleared when the job set changes
+        self._transitive_cache: Dict[str, frozenset] = {}
+        # Per job, its (dependency name, stats or None) pairs; rebuilt after (un)registration
+        self._dependency_stats: Optional[Dict[str, tuple]] = None
+        # Jobs left on a dependency cycle by the last topological sort
+        self._cyclic_jobs: List[str] = []
+        # Bumped on any registration or enable/disable, for callers caching derived views
+        self.version = 0
+        # Number of jobs with 'enabled' set, kept in step with register/enable/disable
+        self.enabled_count = 0
     
     def register_job(self, 
                     name: str, 
-                    func: Callable, 
+                    func: Union[Callable, str], 
                     schedule_config: Dict[str, Any],
                     category: JobCategory,
                     priority: JobPriority = JobPriority.MEDIUM,
@@ -50,7 +147,7 @@ class JobRegistry:
         
         Args:
             name: Unique job name
-            func: Function to execute
+            func: Function to execute, or a 'module:function' path imported on first run
             schedule_config: Schedule configuration
             category: Job category
             priority: Job priority
@@ -61,6 +158,9 @@ class JobRegistry:
         if name in self.jobs:
             raise ValueError(f"Job '{name}' already registered")
         
+        if isinstance(func, str):
+            func = lazy_job_function(func)
+        
         # Create properly wrapped job
         wrapped_job = self._create_wrapped_job(func, name, category, priority)
         
@@ -69,6 +169,7 @@ class JobRegistry:
             'function': wrapped_job,
             'original_function': func,
             'schedule_config': schedule_config,
+            'schedule_str': format_schedule(schedule_config),  # formatted once, read by summaries
             'category': category,
             'priority': priority,
             'description': description,
@@ -80,19 +181,14 @@ class JobRegistry:
         
         # Add to category
         self.categories[category].append(name)
+        self.enabled_count += 1
+        self._parallel_batches = None
+        self._dependency_stats = None
+        self._transitive_cache.clear()
+        self.version += 1
         
         # Initialize stats
-        with self._stats_lock:
-            self.job_stats[name] = {
-                'executions': 0,
-                'failures': 0,
-                'last_run': None,
-                'last_success': None,
-                'last_failure': None,
-                'total_duration': 0,
-                'average_duration': 0,
-                'last_error': None
-            }
+        self.job_stats[name] = _JobStats()
         
         return wrapped_job
     
@@ -101,7 +197,7 @@ class JobRegistry:
         
         # Import here to avoid circular imports
         from scheduler import telegram_job_wrapper, run_in_thread
-        from services.database_service import DatabaseService
+        from services.database_service import get_database_service
         
         @telegram_job_wrapper(name)
         @wraps(func)
@@ -117,7 +213,7 @@ class JobRegistry:
                 return None
             
             # Initialize database service
-            db_service = DatabaseService()
+            db_service = get_database_service()
             execution_id = None
             start_time = time.time()
             
@@ -189,56 +285,147 @@ class JobRegistry:
         
         return job_wrapper
     
+    def finalize(self):
+        """
+        Validates the dependency graph once all jobs are registered, raising
+        ValueError at startup for unregistered dependencies or cycles instead
+        of silently skipping runs later, and precomputes dependency lookups.
+        """
+        for name, job_info in self.jobs.items():
+            missing = [dep for dep in job_info['dependencies'] if dep not in self.jobs]
+            if missing:
+                raise ValueError(f"Job '{name}' depends on unregistered job(s): {', '.join(missing)}")
+        
+        self.parallel_batches  # topological sort, fills _cyclic_jobs
+        if self._cyclic_jobs:
+            raise ValueError(f"Dependency cycle between jobs: {', '.join(self._cyclic_jobs)}")
+        
+        self._build_dependency_stats()
+        logger.info(f"🔗 Validated dependencies for {len(self.jobs)} jobs")
+    
+    def _build_dependency_stats(self) -> Dict[str, tuple]:
+        self._dependency_stats = {
+            name: tuple((dep_name, self.job_stats.get(dep_name)) for dep_name in job_info['dependencies'])
+            for name, job_info in self.jobs.items()
+        }
+        return self._dependency_stats
+    
     def _check_dependencies(self, job_name: str) -> bool:
         """Check if job dependencies have been met"""
-        job_info = self.jobs[job_name]
-        dependencies = job_info.get('dependencies', [])
+        dependency_stats = self._dependency_stats
+        if dependency_stats is None:
+            dependency_stats = self._build_dependency_stats()
+        dependencies = dependency_stats[job_name]
         
         if not dependencies:
             return True
         
-        with self._stats_lock:
-            for dep_name in dependencies:
-                dep_stats = self.job_stats.get(dep_name)
-                if not dep_stats:
-                    logger.warning(f"Dependency {dep_name} not found for job {job_name}")
-                    return False
-                
-                # Check if dependency ran successfully recently (within last 2 hours)
-                last_success = dep_stats.get('last_success')
-                if not last_success or (time.time() - last_success) > 7200:
-                    logger.warning(f"Dependency {dep_name} hasn't run successfully recently")
-                    return False
+        if self.should_skip(job_name):
+            return False
+        
+        # Check each dependency ran successfully recently (within last 2 hours)
+        fresh_since = time.time() - DEPENDENCY_MAX_AGE
+        for dep_name, dep_stats in dependencies:
+            if not dep_stats:
+                logger.warning(f"Dependency {dep_name} not found for job {job_name}")
+                return False
+            
+            last_success = dep_stats.last_success
+            if not last_success or last_success < fresh_since:
+                logger.warning(f"Dependency {dep_name} hasn't run successfully recently")
+                return False
         
         return True
     
+    def _resolve_transitive_deps(self, job_name: str) -> frozenset:
+        """All direct and indirect dependencies of a job, memoized per job"""
+        cached = self._transitive_cache.get(job_name)
+        if cached is not None:
+            return cached
+        
+        # Placeholder guards against dependency cycles while recursing
+        self._transitive_cache[job_name] = frozenset()
+        job_info = self.jobs.get(job_name)
+        deps = set(job_info['dependencies']) if job_info else set()
+        for dep_name in list(deps):
+            deps |= self._resolve_transitive_deps(dep_name)
+        deps.discard(job_name)
+        
+        resolved = frozenset(deps)
+        self._transitive_cache[job_name] = resolved
+        return resolved
+    
+    def should_skip(self, job_name: str) -> bool:
+        """True if any upstream job's most recent run failed"""
+        for dep_name in self._resolve_transitive_deps(job_name):
+            dep_stats = self.job_stats.get(dep_name)
+            if not dep_stats:
+                continue
+            last_failure, last_success = dep_stats.last_failure, dep_stats.last_success
+            if last_failure and last_failure > (last_success or 0):
+                logger.warning(f"Upstream job {dep_name} failed on its last run")
+                return True
+        return False
+    
     def _update_success_stats(self, job_name: str, duration: float):
         """Update job statistics after successful execution"""
-        with self._stats_lock:
-            stats = self.job_stats[job_name]
-            stats['executions'] += 1
-            stats['last_run'] = time.time()
-            stats['last_success'] = time.time()
-            stats['total_duration'] += duration
-            stats['average_duration'] = stats['total_duration'] / stats['executions']
+        self.job_stats[job_name].record(duration)
     
     def _update_failure_stats(self, job_name: str, duration: float, error: str):
         """Update job statistics after failed execution"""
-        with self._stats_lock:
-            stats = self.job_stats[job_name]
-            stats['executions'] += 1
-            stats['failures'] += 1
-            stats['last_run'] = time.time()
-            stats['last_failure'] = time.time()
-            stats['last_error'] = error
-            stats['total_duration'] += duration
-            stats['average_duration'] = stats['total_duration'] / stats['executions']
+        self.job_stats[job_name].record(duration, error)
+    
+    @property
+    def parallel_batches(self) -> List[List[str]]:
+        """
+        Jobs grouped by dependency depth (Kahn's algorithm): every job's
+        dependencies sit in earlier batches, so jobs within a batch are independent.
+        """
+        if self._parallel_batches is None:
+            self._parallel_batches = self._compute_parallel_batches()
+        return self._parallel_batches
+    
+    def _compute_parallel_batches(self) -> List[List[str]]:
+        dependents: Dict[str, List[str]] = {name: [] for name in self.jobs}
+        in_degree: Dict[str, int] = {name: 0 for name in self.jobs}
+        
+        for name, job_info in self.jobs.items():
+            for dep_name in job_info['dependencies']:
+                if dep_name not in self.jobs:
+                    logger.warning(f"Job {name} depends on unregistered job {dep_name}")
+                    continue
+                dependents[dep_name].append(name)
+                in_degree[name] += 1
+        
+        batches = []
+        ready = [name for name, degree in in_degree.items() if degree == 0]
+        while ready:
+            batches.append(ready)
+            next_ready = []
+            for name in ready:
+                for dependent in dependents[name]:
+                    in_degree[dependent] -= 1
+                    if in_degree[dependent] == 0:
+                        next_ready.append(dependent)
+            ready = next_ready
+        
+        cyclic = [name for name, degree in in_degree.items() if degree > 0]
+        self._cyclic_jobs = cyclic
+        if cyclic:
+            logger.error(f"Dependency cycle between jobs: {', '.join(cyclic)}")
+            batches.append(cyclic)
+        return batches
     
     def schedule_all_jobs(self, scheduler):
-        """Schedule all registered and enabled jobs"""
+        """
+        Schedule all registered and enabled jobs in dependency order. The schedule
+        library runs same-tick jobs in the order they were added, so a dependency
+        due at the same time as its dependent is always started first.
+        """
         scheduled_count = 0
         
-        for name, job_info in self.jobs.items():
+        for name in (name for batch in self.parallel_batches for name in batch):
+            job_info = self.jobs[name]
             if not job_info.get('enabled', True):
                 logger.info(f"⏸️ Skipping disabled job: {name}")
                 continue
@@ -297,8 +484,8 @@ class JobRegistry:
     
     def get_job_stats(self, job_name: str) -> Optional[Dict]:
         """Get statistics for a specific job"""
-        with self._stats_lock:
-            return self.job_stats.get(job_name, {}).copy()
+        stats = self.job_stats.get(job_name)
+        return stats.as_dict() if stats else {}
     
     def get_category_stats(self, category: JobCategory) -> Dict:
         """Get aggregated statistics for a job category"""
@@ -307,22 +494,30 @@ class JobRegistry:
         if not category_jobs:
             return {}
         
-        with self._stats_lock:
-            total_executions = sum(self.job_stats[job]['executions'] for job in category_jobs)
-            total_failures = sum(self.job_stats[job]['failures'] for job in category_jobs)
-            
-            return {
-                'total_jobs': len(category_jobs),
-                'total_executions': total_executions,
-                'total_failures': total_failures,
-                'success_rate': ((total_executions - total_failures) / total_executions * 100) if total_executions > 0 else 0,
-                'jobs': category_jobs
-            }
+        # Lock-free reads: each counter is read once, and a run completing
+        # mid-sum only makes the totals one run stale
+        total_executions = total_failures = 0
+        for job in category_jobs:
+            stats = self.job_stats[job]
+            total_executions += stats.executions
+            total_failures += stats.failures
+        
+        return {
+            'total_jobs': len(category_jobs),
+            'total_executions': total_executions,
+            'total_failures': total_failures,
+            'success_rate': ((total_executions - total_failures) / total_executions * 100) if total_executions > 0 else 0,
+            'jobs': category_jobs
+        }
     
     def enable_job(self, job_name: str):
         """Enable a job"""
         if job_name in self.jobs:
+            if not self.jobs[job_name]['enabled']:
+                self.enabled_count += 1
             self.jobs[job_name]['enabled'] = True
+            self._transitive_cache.clear()
+            self.version += 1
             logger.info(f"✅ Enabled job: {job_name}")
         else:
             logger.warning(f"Job not found: {job_name}")
@@ -330,7 +525,11 @@ class JobRegistry:
     def disable_job(self, job_name: str):
         """Disable a job"""
         if job_name in self.jobs:
+            if self.jobs[job_name]['enabled']:
+                self.enabled_count -= 1
             self.jobs[job_name]['enabled'] = False
+            self._transitive_cache.clear()
+            self.version += 1
             logger.info(f"⏸️ Disabled job: {job_name}")
         else:
             logger.warning(f"Job not found: {job_name}")
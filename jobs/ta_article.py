@@ -2,19 +2,32 @@
 
 import logging
 import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
-import requests
-import matplotlib.pyplot as plt
+# Figures are built with the object-oriented API rather than pyplot, whose
+# global "current figure" state isn't safe when tokens are charted in parallel
+from matplotlib.figure import Figure
 
-from services.database_service import DatabaseService
+from services.database_service import get_database_service
 from services.hunter_ai_service import get_hunter_ai_service
+from utils import fastjson
+from utils.http_session import get_http_session
 from utils.x_post import post_thread, upload_media
 from utils.url_helpers import get_article_file_path, get_image_url, get_chart_url, get_article_web_url
 from utils.notion_logger import log_article_to_notion
+from utils.text_utils import utc_date_str
+
+try:
+    import talib  # optional: C implementations of the indicators
+except ImportError:
+    talib = None
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +40,16 @@ TOKENS = {
     "dogecoin": "DOGEUSDT"
 }
 
+# Daily candles per (symbol, limit), reused for an hour so job reruns and
+# retries don't download and parse 1000 candles per token again
+OHLCV_CACHE_TTL = 3600  # seconds
+_ohlcv_cache = {}  # (symbol, limit) -> (time.monotonic() fetched, DataFrame)
+_ohlcv_cache_lock = threading.Lock()
+
+# Idle chart figures, reused across charts and runs instead of building a new
+# Figure/canvas each time; each chart takes one out, so parallel charts never share
+_figure_pool = queue.SimpleQueue()
+
 # -----------------------------------------------------------------------------
 # --- Helper Functions ---
 # -----------------------------------------------------------------------------
@@ -92,31 +115,59 @@ def _get_price_context(df: pd.DataFrame, current_price: float) -> Dict[str, any]
         }
 
 
+def clear_ohlcv_cache():
+    """Drops all cached OHLCV data, forcing the next fetch to hit Binance."""
+    with _ohlcv_cache_lock:
+        _ohlcv_cache.clear()
+
+
 def _fetch_ohlcv(symbol: str, limit=1000) -> pd.DataFrame:
-    """Fetches OHLCV data from the Binance public API."""
+    """
+    Fetches OHLCV data from the Binance public API, served from memory for
+    OHLCV_CACHE_TTL. Returns a copy, since callers add indicator columns in place.
+    """
+    key = (symbol, limit)
+    with _ohlcv_cache_lock:
+        cached = _ohlcv_cache.get(key)
+    if cached and time.monotonic() - cached[0] < OHLCV_CACHE_TTL:
+        logger.info(f"Using cached OHLC data for {symbol}")
+        return cached[1].copy()
+
     url = "https://api.binance.com/api/v3/klines"
     params = {"symbol": symbol, "interval": "1d", "limit": limit}
     try:
-        resp = requests.get(url, params=params, timeout=10)
+        resp = get_http_session().get(url, params=params, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        data = fastjson.loads(resp.content)
+        if not data:
+            return pd.DataFrame()
         
+        # Each kline is [open_time, open, high, low, close, volume, ...] with
+        # prices as strings; convert just those columns straight to float64
+        klines = np.array(data, dtype=object)
         df = pd.DataFrame(
-            data,
-            columns=["timestamp", "open", "high", "low", "close", "volume", 
-                    "close_time", "quote_asset_volume", "trades", 
-                    "taker_buy_base", "taker_buy_quote", "ignore"]
+            klines[:, 1:6].astype(np.float64),
+            columns=["open", "high", "low", "close", "volume"],
+            index=pd.DatetimeIndex(pd.to_datetime(klines[:, 0].astype(np.int64), unit="ms"), name="date")
         )
-        df["date"] = pd.to_datetime(df["timestamp"], unit="ms")
-        df.set_index("date", inplace=True)
-        return df[["open", "high", "low", "close", "volume"]].astype(float)
+        with _ohlcv_cache_lock:
+            _ohlcv_cache[key] = (time.monotonic(), df)
+        return df.copy()
     except Exception as e:
         logger.error(f"Error fetching OHLC for {symbol}: {e}")
         return pd.DataFrame()
 
 
+def _acquire_figure() -> Figure:
+    try:
+        return _figure_pool.get_nowait()
+    except queue.Empty:
+        return Figure(figsize=(12, 8))
+
+
 def _generate_chart(df: pd.DataFrame, token_name: str) -> Optional[str]:
     """Generates and saves a chart, returning the public URL."""
+    fig = _acquire_figure()
     try:
         # Save to /app/posts/images/ to match your volume mount
         out_dir = "/app/posts/images"
@@ -124,19 +175,22 @@ def _generate_chart(df: pd.DataFrame, token_name: str) -> Optional[str]:
         
         df_year = df.loc[df.index > (df.index[-1] - pd.Timedelta(days=365))]
         
-        # Create figure with three panels
-        fig = plt.figure(figsize=(12, 8))
-        gs = fig.add_gridspec(3, 1, height_ratios=[2, 1, 1], hspace=0.4)
+        # Lay out three panels on the (empty) figure; fixed margins leave room
+        # for the title and rotated dates without a bbox_inches='tight' pass
+        gs = fig.add_gridspec(3, 1, height_ratios=[2, 1, 1], hspace=0.4,
+                              left=0.08, right=0.97, top=0.95, bottom=0.12)
         
-        # Price panel with candlesticks
+        # Price panel with candlesticks: all bodies in one bar call, all wicks
+        # in one vlines collection
         ax1 = fig.add_subplot(gs[0])
-        for idx, row in df_year.iterrows():
-            color = 'green' if row['close'] >= row['open'] else 'red'
-            ax1.bar(idx, abs(row['close'] - row['open']), 
-                   bottom=min(row['open'], row['close']), 
-                   width=0.8, color=color, alpha=0.6)
-            ax1.plot([idx, idx], [row['low'], row['high']], 
-                    color=color, linewidth=1)
+        opens = df_year['open'].to_numpy()
+        closes = df_year['close'].to_numpy()
+        candle_colors = np.where(closes >= opens, 'green', 'red')
+        ax1.bar(df_year.index, np.abs(closes - opens), 
+               bottom=np.minimum(opens, closes), 
+               width=0.8, color=candle_colors, alpha=0.6)
+        ax1.vlines(df_year.index, df_year['low'], df_year['high'], 
+                  colors=candle_colors, linewidth=1)
         
         # Add moving averages if present
         if 'sma10' in df_year.columns:
@@ -152,7 +206,7 @@ def _generate_chart(df: pd.DataFrame, token_name: str) -> Optional[str]:
         ax1.set_title(f"{token_name} Price Chart - Last 365 Days")
         ax1.grid(True, alpha=0.3)
         ax1.legend()
-        plt.setp(ax1.get_xticklabels(), visible=False)
+        ax1.tick_params(axis='x', labelbottom=False)
         
         # RSI panel
         ax2 = fig.add_subplot(gs[1])
@@ -163,7 +217,7 @@ def _generate_chart(df: pd.DataFrame, token_name: str) -> Optional[str]:
             ax2.set_ylabel('RSI')
             ax2.grid(True, alpha=0.3)
             ax2.legend()
-        plt.setp(ax2.get_xticklabels(), visible=False)
+        ax2.tick_params(axis='x', labelbottom=False)
         
         # MACD panel
         ax3 = fig.add_subplot(gs[2])
@@ -174,21 +228,21 @@ def _generate_chart(df: pd.DataFrame, token_name: str) -> Optional[str]:
                     color='orange', label='Signal')
             hist = df_year['macd'] - df_year['macd_signal']
             ax3.bar(df_year.index, hist, 
-                   color=['red' if x < 0 else 'green' for x in hist], 
+                   color=np.where(hist < 0, 'red', 'green'), 
                    alpha=0.3)
             ax3.set_ylabel('MACD')
             ax3.grid(True, alpha=0.3)
             ax3.legend()
         
-        plt.xticks(rotation=45)
+        ax3.tick_params(axis='x', labelrotation=45)
         fig.align_ylabels([ax1, ax2, ax3])
         
         # Use naming convention from your example: {token}_{date}_advanced.png
-        date_str = datetime.utcnow().strftime("%Y-%m-%d")
+        date_str = utc_date_str()
         file_name = f"{token_name.lower()}_{date_str}_advanced.png"
         img_path = os.path.join(out_dir, file_name)
-        plt.savefig(img_path, dpi=300, bbox_inches='tight', pad_inches=0.2)
-        plt.close()
+        # 150 DPI gives a 1800x1200 image; fast zlib level, as the PNG is written once
+        fig.savefig(img_path, dpi=150, format='png', pil_kwargs={'compress_level': 1})
         
         # FIXED: Use get_chart_url() instead of get_image_url()
         chart_url = get_chart_url(file_name)
@@ -198,6 +252,10 @@ def _generate_chart(df: pd.DataFrame, token_name: str) -> Optional[str]:
     except Exception as e:
         logger.error(f"Failed to generate chart for {token_name}: {e}")
         return None
+    finally:
+        # Drop this chart's axes and artists before returning the figure to the pool
+        fig.clear()
+        _figure_pool.put(fig)
 
 
 def _analyze_token_patterns(df: pd.DataFrame) -> Dict:
@@ -251,86 +309,114 @@ def _analyze_token_patterns(df: pd.DataFrame) -> Dict:
     return patterns
 
 
+def _ema(series: pd.Series, length: int) -> pd.Series:
+    """EMA seeded with the SMA of the first `length` values (pandas_ta's default)."""
+    if len(series) < length:
+        return pd.Series(np.nan, index=series.index)
+    seeded = series.copy()
+    seeded.iloc[:length - 1] = np.nan
+    seeded.iloc[length - 1] = series.iloc[:length].mean()
+    return seeded.ewm(span=length, adjust=False).mean()
+
+
+def _rsi(close: pd.Series, length: int = 14) -> pd.Series:
+    """RSI with Wilder's smoothing (pandas_ta's formula)."""
+    delta = close.diff()
+    gains = delta.clip(lower=0).ewm(alpha=1 / length, min_periods=length).mean()
+    losses = delta.clip(upper=0).abs().ewm(alpha=1 / length, min_periods=length).mean()
+    return 100 * gains / (gains + losses)
+
+
+def _macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9):
+    """Returns the (macd, signal) lines."""
+    macd = _ema(close, fast) - _ema(close, slow)
+    first_valid = macd.first_valid_index()
+    if first_valid is None:
+        return macd, macd
+    return macd, _ema(macd.loc[first_valid:], signal).reindex(macd.index)
+
+
 def _add_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    """Adds technical indicators to DataFrame."""
-    df["sma10"] = ta.sma(df["close"], length=10)
-    df["sma50"] = ta.sma(df["close"], length=50)
-    df["sma200"] = ta.sma(df["close"], length=200)
-    df["rsi"] = ta.rsi(df["close"], length=14)
-    
-    macd = ta.macd(df["close"])
-    if macd is not None and not macd.empty:
-        macd_col = next((col for col in macd.columns if col.startswith('MACD_')), None)
-        signal_col = next((col for col in macd.columns if col.startswith('MACDs_')), None)
-        
-        if macd_col and signal_col:
-            df["macd"] = macd[macd_col]
-            df["macd_signal"] = macd[signal_col]
+    """
+    Returns df with technical indicator columns, starting at the first row
+    where every indicator is defined (the SMA200 warm-up).
+    Uses TA-Lib when installed; otherwise vectorized pandas rolling/ewm with
+    the same formulas pandas_ta used.
+    """
+    close = df["close"]
+    if talib is not None:
+        values = close.to_numpy()
+        macd, macd_signal, _ = talib.MACD(values, fastperiod=12, slowperiod=26, signalperiod=9)
+        indicators = {
+            "sma10": talib.SMA(values, timeperiod=10),
+            "sma50": talib.SMA(values, timeperiod=50),
+            "sma200": talib.SMA(values, timeperiod=200),
+            "rsi": talib.RSI(values, timeperiod=14),
+            "macd": macd,
+            "macd_signal": macd_signal,
+        }
+    else:
+        macd, macd_signal = _macd(close)
+        indicators = {
+            "sma10": close.rolling(10).mean().to_numpy(),
+            "sma50": close.rolling(50).mean().to_numpy(),
+            "sma200": close.rolling(200).mean().to_numpy(),
+            "rsi": _rsi(close, 14).to_numpy(),
+            "macd": macd.to_numpy(),
+            "macd_signal": macd_signal.to_numpy(),
+        }
     
-    df.dropna(inplace=True)
-    return df
+    # Indicators are only undefined during their warm-up, so slice that off
+    # once instead of dropna() copying every row and column
+    complete = ~np.isnan(np.column_stack(list(indicators.values()))).any(axis=1)
+    start = int(np.argmax(complete)) if complete.any() else len(df)
+    return df.iloc[start:].assign(**{column: values[start:] for column, values in indicators.items()})
 
 
-# -----------------------------------------------------------------------------
-# --- Main Job Function ---
-# -----------------------------------------------------------------------------
-
-def run_ta_article_job():
+def _analyze_one_token(name: str, symbol: str, date_str: str, hunter_ai) -> Optional[Tuple[Dict, str]]:
     """
-    Generates a comprehensive weekly TA article covering multiple tokens,
-    saves it locally, and posts an announcement tweet.
+    Fetches, charts and analyzes one token.
+    Returns (analysis_data, article section markdown), or None if there is no usable data.
     """
-    logger.info("Starting Weekly TA Article Job...")
-    db_service = DatabaseService()
-    hunter_ai = get_hunter_ai_service()
+    logger.info(f"Analyzing {name}...")
     
-    try:
-        date_str = datetime.utcnow().strftime("%B %d, %Y")
-        article_sections = []
-        token_analyses_summary = []
+    df = _fetch_ohlcv(symbol)
+    if df.empty:
+        logger.warning(f"No data for {name}, skipping")
+        return None
 
-        # 1. Analyze each token
-        for name, symbol in TOKENS.items():
-            logger.info(f"Analyzing {name}...")
-            
-            df = _fetch_ohlcv(symbol)
-            if df.empty:
-                logger.warning(f"No data for {name}, skipping")
-                continue
-
-            df = _add_indicators(df)
-            if df.empty:
-                logger.warning(f"Insufficient data after indicators for {name}")
-                continue
-
-            chart_url = _generate_chart(df, name.title())
-            patterns = _analyze_token_patterns(df)
-            price = df['close'].iloc[-1]
-            price_context = _get_price_context(df, price)
-            
-            # Prepare analysis summary
-            analysis_data = {
-                'name': name.title(),
-                'price': price,
-                'chart_url': chart_url,
-                'patterns': patterns,
-                'price_context': price_context,
-                'indicators': {
-                    'rsi': df['rsi'].iloc[-1],
-                    'sma10': df['sma10'].iloc[-1],
-                    'sma50': df['sma50'].iloc[-1],
-                    'sma200': df['sma200'].iloc[-1],
-                    'macd': df['macd'].iloc[-1] if 'macd' in df.columns else 0,
-                    'macd_signal': df['macd_signal'].iloc[-1] if 'macd_signal' in df.columns else 0
-                }
-            }
-            token_analyses_summary.append(analysis_data)
-            
-            # Generate token-specific analysis with Hunter's voice
-            volume_display = _format_volume(patterns['volume']['current'])
-            volume_avg_display = _format_volume(patterns['volume']['average'])
-            
-            token_prompt = f"""You are a crypto technical analyst. Write ONLY about the data provided below.
+    df = _add_indicators(df)
+    if df.empty:
+        logger.warning(f"Insufficient data after indicators for {name}")
+        return None
+
+    chart_url = _generate_chart(df, name.title())
+    patterns = _analyze_token_patterns(df)
+    price = df['close'].iloc[-1]
+    price_context = _get_price_context(df, price)
+    
+    # Prepare analysis summary
+    analysis_data = {
+        'name': name.title(),
+        'price': price,
+        'chart_url': chart_url,
+        'patterns': patterns,
+        'price_context': price_context,
+        'indicators': {
+            'rsi': df['rsi'].iloc[-1],
+            'sma10': df['sma10'].iloc[-1],
+            'sma50': df['sma50'].iloc[-1],
+            'sma200': df['sma200'].iloc[-1],
+            'macd': df['macd'].iloc[-1] if 'macd' in df.columns else 0,
+            'macd_signal': df['macd_signal'].iloc[-1] if 'macd_signal' in df.columns else 0
+        }
+    }
+    
+    # Generate token-specific analysis with Hunter's voice
+    volume_display = _format_volume(patterns['volume']['current'])
+    volume_avg_display = _format_volume(patterns['volume']['average'])
+    
+    token_prompt = f"""You are a crypto technical analyst. Write ONLY about the data provided below.
 
 CURRENT LIVE DATA for {name.title()} as of {date_str}:
 - Current Price: ${price:,.2f}
@@ -363,19 +449,53 @@ STRICT RULES:
 6. Write in a direct, analytical style
 7. Maximum 300 words
 """
-            
-            token_analysis = hunter_ai.generate_analysis(token_prompt, max_tokens=500)
-            
-            if chart_url:
-                article_sections.append(
-                    f"\n## {name.title()} Analysis\n\n"
-                    f"![{name.title()} Chart]({chart_url})\n\n"
-                    f"{token_analysis}\n"
-                )
-            else:
-                article_sections.append(f"\n## {name.title()} Analysis\n\n{token_analysis}\n")
+    
+    token_analysis = hunter_ai.generate_analysis(token_prompt, max_tokens=500)
+    
+    if chart_url:
+        section = (
+            f"\n## {name.title()} Analysis\n\n"
+            f"![{name.title()} Chart]({chart_url})\n\n"
+            f"{token_analysis}\n"
+        )
+    else:
+        section = f"\n## {name.title()} Analysis\n\n{token_analysis}\n"
+    return analysis_data, section
+
 
-        # 2. Generate market overview (opening paragraph)
+# -----------------------------------------------------------------------------
+# --- Main Job Function ---
+# -----------------------------------------------------------------------------
+
+def run_ta_article_job():
+    """
+    Generates a comprehensive weekly TA article covering multiple tokens,
+    saves it locally, and posts an announcement tweet.
+    """
+    logger.info("Starting Weekly TA Article Job...")
+    db_service = get_database_service()
+    hunter_ai = get_hunter_ai_service()
+    
+    try:
+        date_str = datetime.utcnow().strftime("%B %d, %Y")
+        article_sections = []
+        token_analyses_summary = []
+
+        # 1. Analyze each token; tokens are independent (network + AI bound),
+        # so run them concurrently and keep the results in TOKENS order
+        with ThreadPoolExecutor(max_workers=len(TOKENS)) as executor:
+            results = list(executor.map(
+                lambda item: _analyze_one_token(item[0], item[1], date_str, hunter_ai),
+                TOKENS.items()
+            ))
+        for result in results:
+            if result:
+                analysis_data, section = result
+                token_analyses_summary.append(analysis_data)
+                article_sections.append(section)
+
+        # 2. Market overview (opening paragraph) prompt
+        overview_prompt = None
         if token_analyses_summary:
             btc_analysis = next((a for a in token_analyses_summary if a['name'] == 'Bitcoin'), None)
             
@@ -396,12 +516,11 @@ RULES:
 - Keep it professional and direct
 - Minimal emojis
 """
-                
-                market_overview = hunter_ai.generate_analysis(overview_prompt, max_tokens=200)
             else:
                 market_overview = f"Welcome to this week's technical analysis for {date_str}."
 
-        # 3. Generate cross-market analysis
+        # 3. Cross-market analysis prompt
+        cross_market_prompt = None
         if token_analyses_summary:
             summary_lines = [
                 f"- {a['name']}: ${a['price']:,.2f}, {a['patterns']['trend']} trend"
@@ -433,15 +552,19 @@ STRICT RULES:
 6. Maximum 400 words
 7. End with "Follow @Web3_Dobie for more insights"
 """
+
+        # Both write-ups only need the token summaries, not each other, so
+        # generate them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            overview_future = executor.submit(hunter_ai.generate_analysis, overview_prompt, max_tokens=200) if overview_prompt else None
+            cross_market_future = executor.submit(hunter_ai.generate_analysis, cross_market_prompt, max_tokens=800) if cross_market_prompt else None
             
-            cross_market_content = hunter_ai.generate_analysis(
-                cross_market_prompt, 
-                max_tokens=800
-            )
-            
-            article_sections.append(
-                "\n## Cross-Market Analysis\n\n" + cross_market_content
-            )
+            if overview_future:
+                market_overview = overview_future.result()
+            if cross_market_future:
+                article_sections.append(
+                    "\n## Cross-Market Analysis\n\n" + cross_market_future.result()
+                )
 
         # 4. Assemble and save the final article
         article_title = f"Weekly Technical Analysis: {date_str}"
@@ -469,7 +592,7 @@ Hunter the Web3 Dobie
         )
         
         # Save to file
-        date_str_filename = datetime.utcnow().strftime("%Y-%m-%d")
+        date_str_filename = utc_date_str()
         file_name = f"{date_str_filename}_weekly-technical-analysis.md"
         article_path = f"/app/posts/ta/{file_name}"
         
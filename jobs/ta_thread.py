@@ -8,12 +8,16 @@ import pandas_ta as ta
 import requests
 import matplotlib.pyplot as plt
 
-from services.database_service import DatabaseService
+from services.database_service import get_database_service
 from services.ai_service import get_ai_service
 from utils.x_post import post_thread, upload_media
 
 logger = logging.getLogger(__name__)
 
+# pandas_ta's column names for macd() with its default (12, 26, 9) parameters
+MACD_COL = "MACD_12_26_9"
+MACD_SIGNAL_COL = "MACDs_12_26_9"
+
 # -----------------------------------------------------------------------------
 # --- Helper Functions (migrated from ta_thread_generator.py) ---
 # -----------------------------------------------------------------------------
@@ -93,13 +97,14 @@ def _add_indicators(df: pd.DataFrame) -> pd.DataFrame:
     macd = ta.macd(df["close"])
     
     if macd is not None and not macd.empty:
-        # Robustly find the correct column names instead of guessing
-        macd_col = next((col for col in macd.columns if col.startswith('MACD_')), None)
-        signal_col = next((col for col in macd.columns if col.startswith('MACDs_')), None)
+        macd_col, signal_col = MACD_COL, MACD_SIGNAL_COL
+        if macd_col not in macd.columns or signal_col not in macd.columns:
+            # Other pandas_ta versions may name them differently; search by prefix
+            macd_col = next((col for col in macd.columns if col.startswith('MACD_')), None)
+            signal_col = next((col for col in macd.columns if col.startswith('MACDs_')), None)
         
         if macd_col and signal_col:
-            df["macd"] = macd[macd_col]
-            df["macd_signal"] = macd[signal_col]
+            df[["macd", "macd_signal"]] = macd[[macd_col, signal_col]].to_numpy()
         else:
             logger.warning("Could not find expected MACD columns in pandas_ta result.")
 
@@ -127,7 +132,7 @@ def run_ta_thread_job(token: str):
     and logs the new analysis back to the DB.
     """
     logger.info(f"🎨 Starting TA Thread Job for ${token.upper()}...")
-    db_service = DatabaseService()
+    db_service = get_database_service()
     ai_service = get_ai_service()
 
     try:
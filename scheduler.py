@@ -6,6 +6,8 @@ import signal
 import tempfile
 import traceback
 import threading
+import itertools
+import queue
 import subprocess
 import psutil
 import requests
@@ -25,11 +27,10 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 # Import job registry system
-from jobs.registry import JobRegistry, JobCategory, JobPriority
+from jobs.registry import JobRegistry, JobCategory, JobPriority, CATEGORY_TITLES
 from jobs.definitions import setup_all_jobs, print_job_summary
 
 # Import utilities
-from hunter_http_server import start_hunter_server
 from utils.tg_notifier import send_telegram_message
 from utils.telegram_log_handler import TelegramHandler
 
@@ -116,10 +117,27 @@ monitoring_stats = {
     "server_ready": False
 }
 
+# Job threads bump the counters concurrently; itertools.count increments
+# atomically in C, unlike `+= 1` on a dict value, and needs no lock
+_next_job_executed = itertools.count(1).__next__
+_next_job_failed = itertools.count(1).__next__
+
+# Latest system metrics, refreshed by the background sampler thread
+_SYS_STATS = {"cpu_percent": None, "memory_percent": None, "disk_percent": None, "sampled_at": None}
+_SYS_SAMPLE_INTERVAL = 5  # seconds
+_DISK_SAMPLE_INTERVAL = 60  # statvfs can stall on slow mounts, so sample it less often
+
+# Set on shutdown; background loops wait on it instead of sleeping
+_shutdown_event = threading.Event()
+
 # Global job registry and HTTP server manager
 job_registry = JobRegistry()
 http_server_manager = None
 
+# Persistent session for probing our own HTTP server (reuses the TCP connection)
+HTTP_HEALTH_URL = 'http://localhost:3001/health'
+_http_probe_session = requests.Session()
+
 def kill_process_on_port(port: int):
     """Find and kill any process that is listening on the specified port."""
     try:
@@ -218,7 +236,7 @@ def telegram_job_wrapper(job_name: str):
             
             try:
                 result = func(*args, **kwargs)
-                monitoring_stats["jobs_executed"] += 1
+                monitoring_stats["jobs_executed"] = _next_job_executed()
                 duration = datetime.now() - start_time
                 
                 logger.info(f"✅ Job {job_name} completed successfully in {str(duration).split('.')[0]}")
@@ -227,7 +245,7 @@ def telegram_job_wrapper(job_name: str):
                 return result
                 
             except Exception as e:
-                monitoring_stats["jobs_failed"] += 1
+                monitoring_stats["jobs_failed"] = _next_job_failed()
                 duration = datetime.now() - start_time
                 
                 # --- THIS IS THE FIX ---
@@ -258,6 +276,9 @@ def start_http_server_with_verification():
     logger.info("Starting Hunter HTTP server...")
     
     try:
+        # Imported here, like the job modules, to keep scheduler startup light
+        from hunter_http_server import start_hunter_server
+        
         # Start server in daemon thread
         http_server_thread = threading.Thread(
             target=start_hunter_server,
@@ -271,7 +292,7 @@ def start_http_server_with_verification():
         time.sleep(2)  # Give server time to start
         
         try:
-            response = requests.get('http://localhost:3001/health', timeout=5)
+            response = _http_probe_session.get(HTTP_HEALTH_URL, timeout=5)
             if response.status_code == 200:
                 monitoring_stats["http_server_status"] = "healthy"
                 monitoring_stats["server_ready"] = True
@@ -292,7 +313,7 @@ def start_http_server_with_verification():
 def get_http_server_status():
     """Simple health check"""
     try:
-        response = requests.get('http://localhost:3001/health', timeout=3)
+        response = _http_probe_session.get(HTTP_HEALTH_URL, timeout=3)
         return {
             "status": "ok" if response.status_code == 200 else "unhealthy",
             "details": {
@@ -325,17 +346,57 @@ def graceful_shutdown():
     """Handle graceful shutdown"""
     logger.info("Starting graceful shutdown...")
     
+    # Wake the sampler and main loop immediately
+    _shutdown_event.set()
+    
     # HTTP server is daemon thread - will stop automatically
     logger.info("HTTP server will stop with main process")
     
     logger.info("Graceful shutdown complete")
 
 # System Health and Heartbeat
+def _sys_sampler():
+    """Keep _SYS_STATS fresh so heartbeats never block on psutil."""
+    # Non-blocking cpu_percent measures since the previous call, so prime it
+    # once and then wait on the shutdown event between samples
+    psutil.cpu_percent(interval=None)
+    last_disk_sample = 0
+    while not _shutdown_event.wait(_SYS_SAMPLE_INTERVAL):
+        if time.time() - last_disk_sample >= _DISK_SAMPLE_INTERVAL:
+            try:
+                _SYS_STATS["disk_percent"] = psutil.disk_usage('/').percent
+            except Exception as e:
+                logger.warning(f"Disk usage sampling failed: {e}")
+                _SYS_STATS["disk_percent"] = -1
+            last_disk_sample = time.time()
+        try:
+            cpu_percent = psutil.cpu_percent(interval=None)
+            memory_percent = psutil.virtual_memory().percent
+            _SYS_STATS.update(
+                cpu_percent=cpu_percent,
+                memory_percent=memory_percent,
+                sampled_at=time.time()
+            )
+        except Exception as e:
+            logger.warning(f"System metrics sampling failed: {e}")
+
+def start_system_sampler():
+    """Start the background CPU/memory sampler thread."""
+    sampler_thread = threading.Thread(target=_sys_sampler, daemon=True, name="SystemSampler")
+    sampler_thread.start()
+    return sampler_thread
+
 def get_system_health():
     """Get comprehensive system health details including process server status."""
     try:
-        memory = psutil.virtual_memory()
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = _SYS_STATS["cpu_percent"]
+        memory_percent = _SYS_STATS["memory_percent"]
+        if cpu_percent is None or memory_percent is None:
+            # Sampler hasn't reported yet - take a one-off reading
+            cpu_percent = psutil.cpu_percent(interval=1)
+            memory_percent = psutil.virtual_memory().percent
+        # Disk is only ever read from the sampler; None/-1 mean not sampled or failed
+        disk_percent = _SYS_STATS["disk_percent"]
         uptime_seconds = time.time() - monitoring_stats["scheduler_start_time"]
         
         # Get HTTP server status from process manager
@@ -348,8 +409,9 @@ def get_system_health():
             "jobs_failed": monitoring_stats["jobs_failed"],
             "http_responsive": http_healthy,
             "http_details": http_status,
-            "memory_percent": f"{memory.percent:.1f}%",
+            "memory_percent": f"{memory_percent:.1f}%",
             "cpu_percent": f"{cpu_percent:.1f}%",
+            "disk_percent": f"{disk_percent:.1f}%" if disk_percent is not None and disk_percent >= 0 else "n/a",
         }
     except Exception as e:
         return {"error": str(e)}
@@ -364,7 +426,7 @@ def send_system_heartbeat():
 
     # Get job registry stats
     total_jobs = len(job_registry.jobs)
-    enabled_jobs = sum(1 for job in job_registry.jobs.values() if job['enabled'])
+    enabled_jobs = job_registry.enabled_count
     
     # HTTP server details (simplified)
     http_details = health.get('http_details', {})
@@ -376,7 +438,7 @@ def send_system_heartbeat():
     
     message = (
         f"Uptime: {health['uptime_hours']}h\n"
-        f"Memory: {health['memory_percent']} | CPU: {health['cpu_percent']}\n"
+        f"Memory: {health['memory_percent']} | CPU: {health['cpu_percent']} | Disk: {health['disk_percent']}\n"
         f"Jobs OK: {health['jobs_executed']} | Jobs Failed: {health['jobs_failed']}\n"
         f"Registered Jobs: {enabled_jobs}/{total_jobs} enabled\n"
         f"{server_text}"
@@ -384,12 +446,38 @@ def send_system_heartbeat():
     send_telegram_log(message, "HEARTBEAT", use_markdown=False)
 
 # Job Scheduling
+# Scheduled jobs are handed to a fixed set of long-lived workers through a
+# SimpleQueue (C-level, no Python lock on put/get) instead of a thread per run
+JOB_WORKER_COUNT = 8
+_job_queue = queue.SimpleQueue()
+_job_workers_lock = threading.Lock()
+_job_workers = []
+
+def _job_worker():
+    while True:
+        job_func, args, kwargs = _job_queue.get()
+        try:
+            job_func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Unhandled error in job worker: {e}", exc_info=True)
+
+def _ensure_job_workers():
+    if _job_workers:
+        return
+    with _job_workers_lock:
+        if _job_workers:
+            return
+        for i in range(JOB_WORKER_COUNT):
+            worker = threading.Thread(target=_job_worker, daemon=True, name=f"JobWorker-{i}")
+            worker.start()
+            _job_workers.append(worker)
+
 def run_in_thread(job_func):
-    """Decorator to run a schedule job in a new thread."""
+    """Decorator to run a schedule job on the background job workers."""
     @wraps(job_func)
     def wrapper(*args, **kwargs):
-        job_thread = threading.Thread(target=job_func, args=args, kwargs=kwargs, daemon=True)
-        job_thread.start()
+        _ensure_job_workers()
+        _job_queue.put((job_func, args, kwargs))
     return wrapper
 
 # Utility Functions
@@ -404,7 +492,7 @@ def get_job_status_report():
         if not stats:
             continue
             
-        report.append(f"\n📁 {category.value.upper().replace('_', ' ')}")
+        report.append(f"\n📁 {CATEGORY_TITLES[category]}")
         report.append(f"   Jobs: {stats['total_jobs']}")
         report.append(f"   Executions: {stats['total_executions']}")
         report.append(f"   Failures: {stats['total_failures']}")
@@ -515,6 +603,9 @@ if __name__ == "__main__":
         # ENHANCED: Ensure all directories exist
         ensure_container_directories()
         
+        # Sample CPU/memory in the background for heartbeats
+        start_system_sampler()
+        
         # Pre-emptively kill any process on our port before starting
         logger.info("Performing pre-startup cleanup...")
         kill_process_on_port(3001)
@@ -574,7 +665,7 @@ if __name__ == "__main__":
         loop_iterations = 0
         last_stats_report = time.time()
         
-        while True:
+        while not _shutdown_event.is_set():
             schedule.run_pending()
             loop_iterations += 1
             
@@ -586,7 +677,7 @@ if __name__ == "__main__":
                 last_stats_report = time.time()
                 loop_iterations = 0
             
-            time.sleep(1)
+            _shutdown_event.wait(1)
 
     except KeyboardInterrupt:
         # This is now a fallback, the signal handler should catch Ctrl+C
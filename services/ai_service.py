@@ -9,7 +9,7 @@ import json
 import os
 import time
 from collections import deque
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 from enum import Enum
 
 import google.generativeai as genai
@@ -59,10 +59,8 @@ class FileBasedRateLimiter:
         """Check if we're in a throttle period due to recent 429"""
         import json
         
-        if not os.path.exists(self.throttle_file):
-            return 0
-        
         try:
+            # Single open() instead of exists() + open(): a missing file means no throttle
             with open(self.throttle_file, 'r') as f:
                 data = json.load(f)
                 throttle_until = data.get('throttle_until', 0)
@@ -79,6 +77,8 @@ class FileBasedRateLimiter:
                 os.remove(self.throttle_file)
                 return 0
                 
+        except FileNotFoundError:
+            return 0
         except Exception as e:
             self.logger.error(f"Error checking throttle state: {e}")
             return 0
@@ -99,10 +99,10 @@ class FileBasedRateLimiter:
             fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
             try:
                 # Load recent requests
-                if os.path.exists(self.requests_file):
+                try:
                     with open(self.requests_file, 'r') as f:
                         requests = json.load(f)
-                else:
+                except FileNotFoundError:
                     requests = []
                 
                 # Clean old requests (older than 60 seconds)
@@ -217,6 +217,31 @@ class AIService:
         else:
             return self._generate_azure_thread(prompt, parts, max_tokens, system_instruction, delimiter)
 
+    def stream_thread(self, prompt: str, parts: int, max_tokens: int, system_instruction: str = None, safety_settings: dict = None, delimiter: str = "---") -> Iterator[str]:
+        """
+        Streams a multi-part thread, yielding each part as soon as its delimiter
+        arrives so callers can start posting before the last part is written.
+        Nothing is requested until the first part is pulled. 429s are retried
+        like generate_thread only until the first text arrives; after that a
+        retry would repeat parts the caller may already have posted.
+        """
+        if self.provider == AIProvider.GEMINI:
+            full_prompt = f"{prompt}\n\nPlease generate exactly {parts} parts separated by '{delimiter}'."
+            chunks = self._stream_gemini_content(full_prompt, max_tokens, system_instruction, safety_settings)
+        else:
+            system_content = system_instruction or f"Generate {parts} paragraphs separated by '{delimiter}'."
+            chunks = self._stream_azure_text(prompt, max_tokens, system_content)
+        
+        buffer = ""
+        for chunk in chunks:
+            buffer += chunk
+            while delimiter in buffer:
+                part, buffer = buffer.split(delimiter, 1)
+                if part.strip():
+                    yield part.strip()
+        if buffer.strip():
+            yield buffer.strip()
+
     # ==================== GEMINI IMPLEMENTATION (UNIFIED) ====================
 
     def _generate_gemini_content(self, prompt: str, max_tokens: int, system_instruction: Optional[str], safety_settings: Optional[Dict]) -> str:
@@ -261,18 +286,7 @@ class AIService:
                 
                 # Check if it's a 429 rate limit error
                 if '429' in error_str or 'quota' in error_str.lower():
-                    # Extract retry delay from error if available
-                    retry_delay = 60  # Default to 60 seconds
-                    if 'retry_delay' in error_str:
-                        # Try to parse retry_delay from error message
-                        import re
-                        match = re.search(r'seconds: (\d+)', error_str)
-                        if match:
-                            retry_delay = int(match.group(1))
-                    
-                    # Record the 429 for all processes to respect
-                    if self.rate_limiter:
-                        self.rate_limiter.record_429_error(retry_delay)
+                    self._record_gemini_429(error_str)
                     
                     if attempt < max_retries - 1:
                         # Exponential backoff: 10s, 20s, 40s
@@ -296,6 +310,85 @@ class AIService:
         # Should never reach here, but just in case
         raise Exception("Max retries exceeded for Gemini API")
 
+    def _record_gemini_429(self, error_str: str):
+        """Records a 429 (with the API's retry delay, if given) for all processes to respect."""
+        retry_delay = 60  # Default to 60 seconds
+        if 'retry_delay' in error_str:
+            # Try to parse retry_delay from error message
+            import re
+            match = re.search(r'seconds: (\d+)', error_str)
+            if match:
+                retry_delay = int(match.group(1))
+        
+        if self.rate_limiter:
+            self.rate_limiter.record_429_error(retry_delay)
+
+    def _stream_gemini_content(self, prompt: str, max_tokens: int, system_instruction: Optional[str], safety_settings: Optional[Dict]) -> Iterator[str]:
+        """
+        Yields Gemini's response text chunk by chunk, with the same 429 recovery
+        as _generate_gemini_content until the first chunk has been yielded.
+        """
+        if self.rate_limiter:
+            self.rate_limiter.wait_if_needed()
+        
+        max_retries = 3
+        base_delay = 10  # Start with 10 second delay
+        yielded = False
+        
+        model_name = os.getenv('GEMINI_MODEL', 'gemini-1.5-pro-latest')
+        model = genai.GenerativeModel(model_name, system_instruction=system_instruction)
+        generation_config = genai.types.GenerationConfig(
+            temperature=0.7,
+            max_output_tokens=max_tokens,
+            top_p=1.0,
+        )
+        
+        for attempt in range(max_retries):
+            try:
+                response = model.generate_content(
+                    prompt,
+                    generation_config=generation_config,
+                    safety_settings=safety_settings,
+                    request_options={"timeout": 45},
+                    stream=True
+                )
+                finish_reason = None
+                for chunk in response:
+                    if chunk.candidates and chunk.candidates[0].finish_reason:
+                        finish_reason = chunk.candidates[0].finish_reason.name
+                    if chunk.parts:
+                        yielded = True
+                        yield chunk.text
+                
+                if not yielded:
+                    raise ValueError(f"Gemini returned no content. Finish Reason: {finish_reason or 'UNKNOWN'}")
+                if finish_reason and finish_reason != "STOP":
+                    # e.g. SAFETY or MAX_TOKENS: the thread is cut short
+                    self.logger.warning(f"Gemini stream ended early. Finish Reason: {finish_reason}")
+                return
+                
+            except Exception as e:
+                error_str = str(e)
+                
+                # Once parts may have been consumed, a retry would duplicate them
+                if not yielded and ('429' in error_str or 'quota' in error_str.lower()):
+                    self._record_gemini_429(error_str)
+                    
+                    if attempt < max_retries - 1:
+                        # Exponential backoff: 10s, 20s, 40s
+                        wait_time = base_delay * (2 ** attempt)
+                        self.logger.warning(
+                            f"429 Rate limit hit (attempt {attempt + 1}/{max_retries}). "
+                            f"Waiting {wait_time}s before retry..."
+                        )
+                        time.sleep(wait_time)
+                        continue
+                    self.logger.error(f"Gemini rate limit exceeded after {max_retries} attempts")
+                    raise
+                
+                self.logger.error(f"Gemini streaming generation failed: {e}")
+                raise
+
     # ==================== AZURE IMPLEMENTATIONS (UNCHANGED LOGIC) ====================
 
     def _generate_azure_text(self, prompt: str, max_tokens: int, system_instruction: Optional[str]) -> str:
@@ -331,6 +424,23 @@ class AIService:
             self.logger.error(f"Azure thread generation failed: {e}")
             raise
 
+    def _stream_azure_text(self, prompt: str, max_tokens: int, system_content: str) -> Iterator[str]:
+        """Yields Azure OpenAI's response text chunk by chunk."""
+        try:
+            response = self.azure_client.chat.completions.create(
+                model=os.getenv('AZURE_DEPLOYMENT_ID'),
+                messages=[{"role": "system", "content": system_content}, {"role": "user", "content": prompt}],
+                temperature=0.7,
+                max_tokens=max_tokens,
+                stream=True,
+            )
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            self.logger.error(f"Azure streaming generation failed: {e}")
+            raise
+
 # ==================== SINGLETON INSTANCE ====================
 
 _ai_service_instance = None
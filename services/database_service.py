@@ -1,5 +1,6 @@
 # app/services/database_service.py
 
+import json
 import logging
 import psycopg2
 from psycopg2.extras import execute_values
@@ -17,15 +18,21 @@ logger = logging.getLogger(__name__)
 class DatabaseService:
     """Service for all interactions with the PostgreSQL database."""
     _connection_pool = None
+    # getconn() raises PoolError rather than waiting once every connection is out,
+    # so concurrent users (e.g. the HTTP server's workers) size themselves from this
+    POOL_MAXCONN = 30
+    # Bumped after every headline write so in-process readers can drop derived caches
+    headlines_version = 0
 
     def __init__(self):
         if not DatabaseService._connection_pool:
             if not DATABASE_CONFIG:
                 raise ValueError("Database configuration is missing.")
             try:
-                DatabaseService._connection_pool = psycopg2.pool.SimpleConnectionPool(
+                # Threaded pool: the HTTP server and job threads check out concurrently
+                DatabaseService._connection_pool = psycopg2.pool.ThreadedConnectionPool(
                     minconn=2,
-                    maxconn=30,
+                    maxconn=DatabaseService.POOL_MAXCONN,
                     options="-c search_path=hunter_agent,public",
                     **DATABASE_CONFIG
                 )
@@ -37,11 +44,9 @@ class DatabaseService:
     @contextmanager
     def get_connection(self):
         """Context manager for database connections - ensures proper release."""
+        # search_path is set once per connection via the pool's connect options
         conn = self._connection_pool.getconn()
         try:
-            with conn.cursor() as cur:
-                cur.execute("SET search_path TO hunter_agent, public;")
-            conn.commit()
             yield conn
         except Exception as e:
             logging.error(f"Database error: {e}")
@@ -73,6 +78,7 @@ class DatabaseService:
                     inserted_count = cursor.rowcount
                 conn.commit()
                 logging.info(f"Batch insert complete. Inserted {inserted_count} new headlines.")
+                DatabaseService.headlines_version += 1
                 return inserted_count
             except Exception as e:
                 logging.error(f"Error during batch headline insert: {e}")
@@ -86,6 +92,9 @@ class DatabaseService:
         Args:
             headlines_data (list of tuples): Each tuple is:
                 (headline, url, source, ticker, score, ai_provider, hunter_comment)
+        
+        Returns:
+            int: rows inserted or updated, None if the insert failed
         """
         if not headlines_data:
             return 0
@@ -106,11 +115,12 @@ class DatabaseService:
                     inserted_count = cursor.rowcount
                 conn.commit()
                 logging.info(f"Batch insert with comments complete. Inserted/updated {inserted_count} headlines.")
+                DatabaseService.headlines_version += 1
                 return inserted_count
             except Exception as e:
                 logging.error(f"Error during batch headline insert with comments: {e}")
                 conn.rollback()
-                return 0
+                return None
 
     def fetch_unscored_headlines(self, limit=100):
         """Fetches headlines from the database that have not yet been scored."""
@@ -149,11 +159,43 @@ class DatabaseService:
                     updated_count = cursor.rowcount
                 conn.commit()
                 logging.info(f"Batch score update complete. Updated {updated_count} headlines.")
+                DatabaseService.headlines_version += 1
                 return updated_count
             except Exception as e:
                 logging.error(f"Error during batch score update: {e}")
                 conn.rollback()
                 return 0
+
+    def batch_update_headline_comments(self, comment_data):
+        """
+        Backfills hunter_comment for headlines stored without one.
+        
+        Args:
+            comment_data (list of tuples): A list where each tuple is
+                                           (hunter_comment, headline_id).
+        """
+        if not comment_data:
+            return 0
+            
+        sql = """
+            UPDATE hunter_agent.headlines SET
+                hunter_comment = data.hunter_comment
+            FROM (VALUES %s) AS data(hunter_comment, id)
+            WHERE hunter_agent.headlines.id = data.id
+            AND hunter_agent.headlines.hunter_comment IS NULL;
+        """
+        with self.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    execute_values(cursor, sql, comment_data, page_size=100)
+                    updated_count = cursor.rowcount
+                conn.commit()
+                # No headlines_version bump: callers persist comments they are already serving
+                return updated_count
+            except Exception as e:
+                logging.error(f"Error during headline comment backfill: {e}")
+                conn.rollback()
+                return 0
   
     def get_top_headlines(self, count=3, days=1):
         """
@@ -183,6 +225,24 @@ class DatabaseService:
                 logging.error(f"Error fetching top {count} headlines: {e}")
                 return []
 
+    def get_recent_headline_keys(self, hours=24):
+        """
+        Fetches the headline text and URL of everything stored in the last N hours,
+        so ingestion can skip items it has already scored.
+        """
+        sql = """
+            SELECT headline, url FROM hunter_agent.headlines
+            WHERE created_at >= NOW() - INTERVAL %s;
+        """
+        with self.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql, (f'{hours} hours',))
+                    return cursor.fetchall()
+            except Exception as e:
+                logging.error(f"Error fetching recent headline keys: {e}")
+                return []
+
     def get_top_headline(self, days=1):
         """
         Fetches the single highest-scoring, unused headline from the last N days.
@@ -234,6 +294,33 @@ class DatabaseService:
                 conn.rollback()
                 return False
 
+    def mark_headlines_as_used(self, headline_ids):
+        """
+        Marks several headlines as used in a single UPDATE.
+        
+        Args:
+            headline_ids (list of int): The IDs of the headlines to mark as used.
+        """
+        if not headline_ids:
+            return True
+            
+        sql = """
+            UPDATE hunter_agent.headlines
+            SET used_in_thread = TRUE
+            WHERE id = ANY(%s);
+        """
+        with self.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql, (list(headline_ids),))
+                conn.commit()
+                logging.info(f"Marked headlines {list(headline_ids)} as used")
+                return True
+            except Exception as e:
+                logging.error(f"Error marking headlines {list(headline_ids)} as used: {e}")
+                conn.rollback()
+                return False
+
     def get_top_xrp_headline_for_today(self, threshold=7):
         """
         Fetches the highest-scoring, unused XRP headline from the last 24 hours.
@@ -259,6 +346,46 @@ class DatabaseService:
                 logging.error(f"Error fetching top XRP headline: {e}")
                 return None
 
+    def get_xrp_context_for_today(self, threshold=7):
+        """
+        One round-trip for the random post job: whether an XRP special tweet went out
+        in the last 24 hours and, if not, the top unused XRP headline
+        (same filters as get_top_xrp_headline_for_today).
+        
+        Returns:
+            dict: {"posted": bool, "headline": {"id", "headline", "url"} or None}
+        """
+        sql = """
+            SELECT
+                EXISTS (
+                    SELECT 1 FROM hunter_agent.content_log
+                    WHERE content_type = 'xrp_special_tweet'
+                    AND created_at >= NOW() - INTERVAL '24 hours'
+                ) AS posted,
+                h.id, h.headline, h.url
+            FROM (SELECT 1) AS one
+            LEFT JOIN LATERAL (
+                SELECT id, headline, url FROM hunter_agent.headlines
+                WHERE (headline ILIKE '%%XRP%%' OR ticker = 'XRP')
+                AND created_at >= NOW() - INTERVAL '24 hours'
+                AND used_in_thread = FALSE
+                AND score >= %s
+                ORDER BY score DESC
+                LIMIT 1
+            ) AS h ON TRUE;
+        """
+        with self.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql, (threshold,))
+                    posted, headline_id, headline, url = cursor.fetchone()
+                    if posted or headline_id is None:
+                        return {"posted": posted, "headline": None}
+                    return {"posted": False, "headline": {"id": headline_id, "headline": headline, "url": url}}
+            except Exception as e:
+                logging.error(f"Error fetching XRP context for today: {e}")
+                return {"posted": False, "headline": None}
+
     def check_if_content_posted_today(self, content_type: str):
         """
         Checks the content_log to see if a specific type of content was posted today.
@@ -279,6 +406,28 @@ class DatabaseService:
                 logging.error(f"Error checking for recent content of type {content_type}: {e}")
                 return False
 
+    def get_latest_tweet(self):
+        """
+        Fetches the most recent content_log entry that was posted as a tweet.
+        Served by idx_content_log_tweet_created (partial index on tweet_id IS NOT NULL).
+        Returns (content_type, tweet_id, details, created_at) or None.
+        """
+        sql = """
+            SELECT content_type, tweet_id, details, created_at
+            FROM hunter_agent.content_log
+            WHERE tweet_id IS NOT NULL
+            ORDER BY created_at DESC
+            LIMIT 1;
+        """
+        with self.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql)
+                    return cursor.fetchone()
+            except Exception as e:
+                logging.error(f"Error fetching latest tweet: {e}")
+                return None
+
     def get_latest_ta_for_token(self, token: str):
         """
         Fetches the most recent TA data entry for a given token to use as "memory".
@@ -360,6 +509,9 @@ class DatabaseService:
                 conn.rollback()
                 return False
 
+    # Whitelist of tables that can be purged (security measure)
+    PURGEABLE_TABLES = frozenset({'headlines', 'content_log', 'ta_data', 'job_executions'})
+
     def purge_old_records(self, table_name: str, days_to_keep: int):
         """
         Deletes records from a specified table that are older than N days.
@@ -376,14 +528,11 @@ class DatabaseService:
         Returns:
             int: Number of records deleted, or 0 if operation failed.
         """
-        # Whitelist of tables that can be purged (security measure)
-        PURGEABLE_TABLES = {'headlines', 'content_log', 'ta_data', 'job_executions'}
-        
         # Step 1: Whitelist validation
-        if table_name not in PURGEABLE_TABLES:
+        if table_name not in self.PURGEABLE_TABLES:
             logger.error(
                 f"Security: Invalid table name for purging: '{table_name}'. "
-                f"Only these tables can be purged: {', '.join(sorted(PURGEABLE_TABLES))}"
+                f"Only these tables can be purged: {', '.join(sorted(self.PURGEABLE_TABLES))}"
             )
             return 0
         
@@ -434,6 +583,72 @@ class DatabaseService:
                 conn.rollback()
                 return 0
 
+    def purge_old_records_batch(self, retention_policies: dict) -> dict:
+        """
+        Purges several tables in one connection and one transaction: a single
+        schema check for all tables, then one DELETE per table and one commit.
+        Same whitelist and schema verification as purge_old_records.
+        
+        Args:
+            retention_policies (dict): {table_name: days_to_keep}
+        
+        Returns:
+            dict: {table_name: records deleted}; 0 for skipped tables, all 0 if
+            the transaction failed and was rolled back.
+        """
+        results = {table_name: 0 for table_name in retention_policies}
+        
+        allowed = [t for t in retention_policies if t in self.PURGEABLE_TABLES]
+        for table_name in retention_policies:
+            if table_name not in self.PURGEABLE_TABLES:
+                logger.error(
+                    f"Security: Invalid table name for purging: '{table_name}'. "
+                    f"Only these tables can be purged: {', '.join(sorted(self.PURGEABLE_TABLES))}"
+                )
+        if not allowed:
+            return results
+        
+        with self.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT table_name
+                        FROM information_schema.tables 
+                        WHERE table_schema = 'hunter_agent' 
+                        AND table_name = ANY(%s);
+                    """, (allowed,))
+                    existing = {row[0] for row in cursor.fetchall()}
+                    
+                    for table_name in allowed:
+                        if table_name not in existing:
+                            logger.error(
+                                f"Table 'hunter_agent.{table_name}' does not exist in the database. "
+                                f"Skipping purge operation."
+                            )
+                            continue
+                        
+                        days_to_keep = retention_policies[table_name]
+                        cursor.execute(f"""
+                            DELETE FROM hunter_agent.{table_name}
+                            WHERE created_at < NOW() - INTERVAL %s;
+                        """, (f'{days_to_keep} days',))
+                        results[table_name] = cursor.rowcount
+                
+                conn.commit()
+                
+                for table_name, deleted_count in results.items():
+                    if table_name in existing:
+                        logger.info(
+                            f"✅ Purged {deleted_count} records older than "
+                            f"{retention_policies[table_name]} days from 'hunter_agent.{table_name}'."
+                        )
+                return results
+                
+            except Exception as e:
+                logger.error(f"❌ Error during batch purge, rolled back: {e}", exc_info=True)
+                conn.rollback()
+                return {table_name: 0 for table_name in retention_policies}
+
     def log_content(self, content_type: str, details: str, tweet_id: str = None, 
                     headline_id: int = None, ai_provider: str = None, notion_url: str = None):
         """
@@ -471,6 +686,9 @@ class DatabaseService:
         """
         Fetches the top N highest-scoring headlines from recent hours for display purposes.
         Now includes pre-generated hunter_comment if available.
+        
+        Returns:
+            list: headline dicts (empty if none match), None if the query failed
         """
         sql = f"""
             SELECT id, headline, url, hunter_comment FROM hunter_agent.headlines
@@ -489,7 +707,7 @@ class DatabaseService:
                     return []
             except Exception as e:
                 logging.error(f"Error fetching recent headlines for display: {e}")
-                return []
+                return None
 
     # ========================================
     # Job execution tracking operations
@@ -508,8 +726,6 @@ class DatabaseService:
         Returns:
             int: execution_id if successful, None if failed
         """
-        import json
-        
         sql = """
             INSERT INTO hunter_agent.job_executions 
             (job_name, category, started_at, status, metadata)
@@ -550,8 +766,6 @@ class DatabaseService:
         Returns:
             bool: True if successful, False if failed
         """
-        import json
-        
         sql = """
             UPDATE hunter_agent.job_executions
             SET completed_at = NOW(),
@@ -709,4 +923,15 @@ class DatabaseService:
         except Exception as e:
             # The logger will now be correctly defined
             logger.error(f"Database health check failed: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+# Singleton instance
+_database_service = None
+
+def get_database_service():
+    """Provides access to the singleton database service (shares the class-level pool)."""
+    global _database_service
+    if _database_service is None:
+        _database_service = DatabaseService()
+    return _database_service
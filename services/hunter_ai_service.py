@@ -1,5 +1,9 @@
 # services/hunter_ai_service.py
 
+import json
+import logging
+import re
+
 from .ai_service import get_ai_service
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
@@ -11,6 +15,14 @@ HUNTER_AGENT_SAFETY_SETTINGS = {
     HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
 }
 
+logger = logging.getLogger(__name__)
+
+# "1. comment" / "2) comment" lines in batched responses
+_NUMBERED_LINE = re.compile(r'^\s*(\d+)[.)]\s*(.+?)\s*$')
+
+# Markdown code fence models sometimes wrap JSON responses in
+_JSON_FENCE = re.compile(r'^\s*```(?:json)?\s*(.*?)\s*```\s*$', re.DOTALL)
+
 # Hunter's CORE persona
 HUNTER_CORE_PERSONA = """You are Hunter 🐾, a witty and sharp crypto expert. 
 Your analysis is insightful but never hype-driven. You explain complex topics simply, 
@@ -41,6 +53,40 @@ class HunterAIService:
         except Exception as e:
             raise Exception(f"Error generating comment: {e}")
 
+    def generate_headline_comments_batch(self, headlines: list) -> list:
+        """
+        Generates Hunter's one-sentence takes for several headlines in one AI call.
+        Returns a list aligned with headlines; entries the response didn't cover are None.
+        """
+        if not headlines:
+            return []
+        
+        headlines_text = "\n".join(f"{i}. {h}" for i, h in enumerate(headlines, 1))
+        prompt = f"""Crypto news:
+{headlines_text}
+
+For each headline, write ONE witty sentence ending with: — Hunter 🐾
+Respond with a numbered list matching the headline numbers. Do not include any other text."""
+        
+        try:
+            content = self.ai_service.generate_text(
+                prompt=prompt,
+                max_tokens=200 * len(headlines),
+                system_instruction="You are Hunter, a sharp crypto analyst dog. Be brief and clever.",
+                safety_settings=HUNTER_AGENT_SAFETY_SETTINGS
+            )
+        except Exception as e:
+            raise Exception(f"Error generating batch comments: {e}")
+        
+        comments = [None] * len(headlines)
+        for line in (content or "").splitlines():
+            match = _NUMBERED_LINE.match(line)
+            if match:
+                index = int(match.group(1)) - 1
+                if 0 <= index < len(comments) and comments[index] is None:
+                    comments[index] = match.group(2)
+        return comments
+
     def generate_analysis(self, prompt: str, max_tokens: int = 2000, system_instruction: str = None) -> str:
         """
         Generates long-form analytical content with Hunter's voice.
@@ -67,6 +113,38 @@ class HunterAIService:
         except Exception as e:
             raise Exception(f"Error generating Hunter analysis: {e}")
 
+    def generate_structured(self, prompt: str, max_tokens: int = 4000, system_instruction: str = None):
+        """
+        Generates a JSON object with Hunter's voice in a single AI call, so related
+        outputs (e.g. an article and its promo thread) share one prompt and round-trip.
+        
+        Returns the parsed dict, or None if the response isn't a JSON object.
+        """
+        full_system_instruction = HUNTER_CORE_PERSONA
+        if system_instruction:
+            full_system_instruction += f"\n\n{system_instruction}"
+        
+        try:
+            content = self.ai_service.generate_text(
+                prompt=prompt,
+                max_tokens=max_tokens,
+                system_instruction=full_system_instruction,
+                safety_settings=HUNTER_AGENT_SAFETY_SETTINGS
+            )
+        except Exception as e:
+            raise Exception(f"Error generating Hunter structured content: {e}")
+        
+        content = (content or "").strip()
+        fenced = _JSON_FENCE.match(content)
+        if fenced:
+            content = fenced.group(1)
+        try:
+            data = json.loads(content)
+        except ValueError as e:
+            logger.warning(f"Structured response was not valid JSON: {e}")
+            return None
+        return data if isinstance(data, dict) else None
+
     def generate_content(self, input_text: str, task_rules: str, max_tokens: int) -> str:
         """
         Legacy method for backwards compatibility.
@@ -0,0 +1,26 @@
+# tests/test_data_ingestion.py
+
+import pytest
+
+data_ingestion = pytest.importorskip("jobs.data_ingestion")
+
+
+def _item(headline, url):
+    return {"headline": headline, "url": url, "source": "test", "ticker": ""}
+
+
+def test_screening_keeps_promoted_to_headlines():
+    items = [
+        _item("Coinbase exec promoted to CEO as Armstrong steps back", "https://example.com/1"),
+        _item("SEC chair promoted to Treasury role", "https://example.com/2"),
+    ]
+    assert data_ingestion._screen_headlines(items, []) == items
+
+
+def test_screening_drops_promotional_labels():
+    items = [
+        _item("Sponsored: the next 100x memecoin", "https://example.com/3"),
+        _item("Promoted content: stake with XYZ", "https://example.com/4"),
+        _item("Best wallets of the year [Sponsored]", "https://example.com/5"),
+    ]
+    assert data_ingestion._screen_headlines(items, []) == []
@@ -11,7 +11,7 @@ that are still in use after the major refactoring.
 from .x_post import post_quote_tweet, post_thread, post_tweet, upload_media
 
 # Generic text manipulation helpers
-from .text_utils import insert_cashtags, insert_mentions, slugify
+from .text_utils import insert_cashtags, insert_mentions, insert_cashtags_and_mentions, slugify
 
 # URL construction helpers
 from .url_helpers import (
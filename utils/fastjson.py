@@ -0,0 +1,41 @@
+# utils/fastjson.py
+"""
+Single entry point for JSON encoding/decoding.
+
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise, so callers get the same output either way:
+- dumps() always returns compact UTF-8 bytes, non-ASCII text unescaped
+- loads() accepts bytes or str
+
+Dict keys passed to dumps() must be str: orjson raises TypeError on any
+other key type, while the stdlib fallback would silently coerce int, float,
+bool and None keys to strings.
+"""
+import json
+from datetime import datetime
+
+try:
+    import orjson  # optional: faster, works on bytes directly
+except ImportError:
+    orjson = None
+
+# Compact JSON: no whitespace after ',' and ':' (orjson's only format)
+_SEPARATORS = (',', ':')
+
+def _default(obj):
+    # Match orjson's native datetime output (isoformat) on the stdlib fallback
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj) -> bytes:
+    """Serialize obj to compact JSON bytes. Dict keys must be str."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=_SEPARATORS, ensure_ascii=False, default=_default).encode('utf-8')
+
+def loads(data):
+    """Parse a JSON document from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
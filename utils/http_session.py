@@ -0,0 +1,76 @@
+# utils/http_session.py
+"""
+Shared requests.Session for outbound API calls from jobs.
+
+One session per process keeps TCP/TLS connections alive between calls and
+jobs, and retries transient upstream errors (429/5xx) with a short backoff.
+APIs with a per-minute quota (CoinGecko) also go through a token bucket so
+concurrent jobs don't exhaust it between them.
+"""
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Short backoff (0.3s, 0.6s, 1.2s); Retry-After is ignored so a throttled API
+# fails fast and callers can fall back (e.g. to cached data) instead of stalling
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=[429, 502, 503, 504],
+    respect_retry_after_header=False,
+)
+
+logger = logging.getLogger(__name__)
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    """Provides access to the singleton HTTP session (safe to share across job threads)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=_RETRY)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: allows bursts of up to `capacity` calls, refilled
+    at `capacity / period` tokens per second. acquire() blocks until a token is free.
+    """
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            # Reserve the token now (possibly going negative) so waiters queue up in order
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            logger.info(f"🚦 API rate limit reached, waiting {wait:.1f}s")
+            time.sleep(wait)
+
+# CoinGecko's free tier allows 30 calls/minute
+_coingecko_bucket = TokenBucket(capacity=30, period=60)
+
+def coingecko_get(url: str, **kwargs) -> requests.Response:
+    """GET a CoinGecko URL through the shared session, within the free-tier rate limit."""
+    _coingecko_bucket.acquire()
+    return get_http_session().get(url, **kwargs)
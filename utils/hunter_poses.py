@@ -0,0 +1,37 @@
+# utils/hunter_poses.py
+"""
+Hunter's pose images, shared by the jobs that attach one to a post.
+"""
+
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+HUNTER_POSES_DIR = "/app/content/assets/hunter_poses"
+
+# Pose images on disk, listed once and re-listed at most every 10 minutes so
+# newly deployed assets are picked up without a stat() per lookup
+POSE_MANIFEST_TTL = 600
+_pose_manifest = (None, frozenset())  # (monotonic time listed, image paths)
+
+def available_poses() -> frozenset:
+    """Full paths of the .png pose images currently in HUNTER_POSES_DIR."""
+    global _pose_manifest
+    listed_at, poses = _pose_manifest
+    if listed_at is None or time.monotonic() - listed_at > POSE_MANIFEST_TTL:
+        try:
+            poses = frozenset(
+                os.path.join(HUNTER_POSES_DIR, name)
+                for name in os.listdir(HUNTER_POSES_DIR) if name.endswith(".png")
+            )
+        except OSError as e:
+            logger.warning(f"Could not list pose images in {HUNTER_POSES_DIR}: {e}")
+            poses = frozenset()
+        _pose_manifest = (time.monotonic(), poses)
+    return poses
+
+def pose_exists(image_path) -> bool:
+    """True if image_path is a pose image currently on disk."""
+    return image_path in available_poses()
@@ -6,6 +6,7 @@ by maintaining the limit state in memory based on API response headers.
 Includes a fallback mechanism to reset stale state after 24 hours.
 """
 import logging
+import threading
 import time
 from datetime import datetime, timezone
 
@@ -21,6 +22,8 @@ class RateLimitState:
 
 # Create a single, shared instance for the entire application
 rate_limit_state = RateLimitState()
+# Jobs post from scheduler worker threads, so decrements must not interleave
+_state_lock = threading.Lock()
 
 def update_rate_limit_state_from_headers(headers):
     """Parses headers from a response and updates the global state."""
@@ -63,12 +66,14 @@ def is_rate_limited():
     
     return False
 
-def decrement_rate_limit_counter():
-    """Decrement counter using real timestamps"""
-    if rate_limit_state.remaining > 0:
-        rate_limit_state.remaining -= 1
-        rate_limit_state.last_updated = time.time()  # Use real time, not monotonic
-        
-        logger.info(
-            f"📊 Rate limit counter decremented. Posts remaining: {rate_limit_state.remaining}"
-        )
\ No newline at end of file
+def decrement_rate_limit_counter(count: int = 1) -> int:
+    """Atomically decrement counter (by count posts at once) and return the posts remaining"""
+    with _state_lock:
+        if rate_limit_state.remaining > 0:
+            rate_limit_state.remaining = max(0, rate_limit_state.remaining - count)
+            rate_limit_state.last_updated = time.time()  # Use real time, not monotonic
+            
+            logger.info(
+                f"📊 Rate limit counter decremented. Posts remaining: {rate_limit_state.remaining}"
+            )
+        return rate_limit_state.remaining
\ No newline at end of file
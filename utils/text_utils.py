@@ -3,9 +3,14 @@ Text utility functions for tweet content:
 - extract_ticker: finds tickers by symbol or name
 - insert_cashtags: transforms known tickers into $CASHTAG format.
 - insert_mentions: appends relevant Twitter handles based on keywords.
+- insert_cashtags_and_mentions: both of the above in one call.
+- utc_date_str: today's UTC date as YYYY-MM-DD, for headers and file names.
 """
 
 import re
+import time
+from datetime import date, timedelta
+from functools import lru_cache
 
 # Map full coin names to tickers
 NAME_TO_TICKER = {
@@ -27,6 +32,28 @@ VALID_TICKERS = set(NAME_TO_TICKER.values())
 # Extend for any explicit symbols you want auto-cashtagged
 KNOWN_TICKERS = list(VALID_TICKERS) + ["LINK", "AVAX", "TON"]
 
+# One case-insensitive alternation for all tickers: a single scan per text
+# instead of one re.sub per ticker; texts without a ticker come back untouched
+_CASHTAG_RE = re.compile(
+    r"(?<!\$)\b(" + "|".join(re.escape(t) for t in KNOWN_TICKERS) + r")\b",
+    re.IGNORECASE
+)
+
+# Keyword -> handle appended by insert_mentions
+MENTION_TAGS = {
+    "Ethereum": "@ethereum",
+    "Solana":   "@solana",
+    "Dogecoin": "@dogecoin",
+    "XRP":      "@Ripple",
+    "Coinbase": "@coinbase",
+    "Binance":  "@binance",
+    "Avalanche":"@avax",
+    "Polygon":  "@0xPolygon",
+    "Cardano":  "@Cardano",
+    "Tezos":    "@tezos",
+}
+_MENTION_KEYWORDS = tuple((keyword.lower(), handle) for keyword, handle in MENTION_TAGS.items())
+
 
 def extract_ticker(headline: str) -> str:
     """
@@ -49,36 +76,38 @@ def extract_ticker(headline: str) -> str:
     return "Crypto"
 
 
+def _to_cashtag(match) -> str:
+    return "$" + match.group(1).upper()
+
+
+def _append_mentions(text: str, lower: str) -> str:
+    for keyword, handle in _MENTION_KEYWORDS:
+        if keyword in lower and handle not in text:
+            text += f" {handle}"
+    return text
+
+
 def insert_cashtags(text: str) -> str:
     """
     Prefixes standalone occurrences of known tickers with '$'.
     """
-    for ticker in KNOWN_TICKERS:
-        pattern = r"(?<!\$)\b" + re.escape(ticker) + r"\b"
-        text = re.sub(pattern, f"${ticker}", text, flags=re.IGNORECASE)
-    return text
+    return _CASHTAG_RE.sub(_to_cashtag, text)
 
 
 def insert_mentions(text: str) -> str:
     """
     Appends relevant @mentions based on keywords in the text.
     """
-    mention_tags = {
-        "Ethereum": "@ethereum",
-        "Solana":   "@solana",
-        "Dogecoin": "@dogecoin",
-        "XRP":      "@Ripple",
-        "Coinbase": "@coinbase",
-        "Binance":  "@binance",
-        "Avalanche":"@avax",
-        "Polygon":  "@0xPolygon",
-        "Cardano":  "@Cardano",
-        "Tezos":    "@tezos",
-    }
-    for keyword, handle in mention_tags.items():
-        if keyword.lower() in text.lower() and handle not in text:
-            text += f" {handle}"
-    return text
+    return _append_mentions(text, text.lower())  # lowercased once, not per keyword
+
+
+def insert_cashtags_and_mentions(text: str) -> str:
+    """
+    insert_cashtags then insert_mentions in one call, lowercasing the text once.
+    Cashtags go first so appended handles (e.g. @avax) are never cashtagged.
+    """
+    lower = text.lower()  # '$' insertions don't change keyword matches
+    return _append_mentions(_CASHTAG_RE.sub(_to_cashtag, text), lower)
 
 def sanitize_prompt(text: str) -> str:
     """
@@ -99,6 +128,12 @@ def sanitize_prompt(text: str) -> str:
             .strip()
     )
 
+
+# slugify patterns, compiled once at import
+_SLUG_STRIP_RE = re.compile(r'[^\w\s-]')
+_SLUG_SEPARATOR_RE = re.compile(r'[\s_-]+')
+
+
 def slugify(text: str) -> str:
     """
     Convert a string into a URL-friendly "slug".
@@ -107,7 +142,19 @@ def slugify(text: str) -> str:
     if not text:
         return ""
     text = text.lower()
-    text = re.sub(r'[^\w\s-]', '', text)  # Remove non-alphanumeric chars
-    text = re.sub(r'[\s_-]+', '-', text)   # Replace spaces and hyphens with a single hyphen
+    text = _SLUG_STRIP_RE.sub('', text)       # Remove non-alphanumeric chars
+    text = _SLUG_SEPARATOR_RE.sub('-', text)  # Replace spaces and hyphens with a single hyphen
     text = text.strip('-')
-    return text
\ No newline at end of file
+    return text
+
+
+@lru_cache(maxsize=4)
+def _format_epoch_day(epoch_day: int) -> str:
+    return (date(1970, 1, 1) + timedelta(days=epoch_day)).strftime("%Y-%m-%d")
+
+
+def utc_date_str() -> str:
+    """
+    Today's UTC date as "YYYY-MM-DD", formatted once per day.
+    """
+    return _format_epoch_day(int(time.time()) // 86400)
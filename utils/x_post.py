@@ -6,6 +6,7 @@ are responsible for logging the results.
 
 import logging
 import time
+from typing import Iterable
 from datetime import datetime, timezone
 import tweepy
 import requests
@@ -149,31 +150,44 @@ def post_quote_tweet(text: str, tweet_url: str, category: str = 'quote'):
         logger.error(f"❌ Error posting quote tweet: {e}", exc_info=True)
         return {"final_tweet_id": None, "error": str(e)}
 
-def post_thread(thread_parts: list[str], category: str = 'thread', media_id_first=None, retry=False):
-    """Posts a sequence of tweets as a thread."""
+def post_thread(thread_parts: Iterable[str], category: str = 'thread', media_id_first=None, retry=False):
+    """
+    Posts a sequence of tweets as a thread.
+    thread_parts may be a list or a generator (e.g. AIService.stream_thread), in
+    which case each part is posted as soon as it is produced and 'total' counts
+    only the parts produced before posting stopped.
+    """
+    streamed = not isinstance(thread_parts, (list, tuple))
+    parts = iter(thread_parts)
+    total = None if streamed else len(thread_parts)
+
     if is_rate_limited():
         logging.warning('🚫 Daily tweet limit reached — skipping thread.')
-        return {"posted": 0, "total": len(thread_parts), "final_tweet_id": None, "error": "Daily limit reached"}
+        return {"posted": 0, "total": total or 0, "final_tweet_id": None, "error": "Daily limit reached"}
     
-    if not thread_parts:
+    first_part = next(parts, None)
+    if first_part is None:
         logging.warning('⚠️ No thread parts provided; skipping thread.')
         return {"posted": 0, "total": 0, "final_tweet_id": None, "error": "No thread parts provided"}
 
-    logging.info(f"{'🔁 Retrying' if retry else '📢 Posting'} thread of {len(thread_parts)} parts under category '{category}'.")
+    size = "streamed" if streamed else f"of {total} parts"
+    logging.info(f"{'🔁 Retrying' if retry else '📢 Posting'} thread {size} under category '{category}'.")
     
+    produced = 1
     posted_count = 0
     in_reply_to = None
+    failed = False
 
     try:
         # First tweet
-        first_part = thread_parts[0]
         resp = timed_create_tweet(text=first_part, media_ids=[media_id_first] if media_id_first else None)
         decrement_rate_limit_counter()
         in_reply_to = resp.data['id']
         posted_count = 1
         
         # Replies
-        for part in thread_parts[1:]:
+        for part in parts:
+            produced += 1
             if is_rate_limited():
                 logging.warning("🚫 Daily limit reached mid-thread. Stopping.")
                 break
@@ -187,17 +201,28 @@ def post_thread(thread_parts: list[str], category: str = 'thread', media_id_firs
     except tweepy.errors.TooManyRequests as e:
         # This block handles only the rate limit error
         logging.warning(f"Hit rate limit mid-thread after posting {posted_count} parts.")
+        failed = True
         if e.response: 
             update_rate_limit_state_from_headers(e.response.headers)
     
     except Exception as e:
         # This block is now separate and handles all other potential errors
         logging.error(f"❌ Thread posting failed after {posted_count} parts: {e}", exc_info=True)
+        failed = True
+
+    if streamed:
+        # Stop the generator instead of draining it: parts after a break or
+        # error would never be posted, so don't pay for generating them.
+        # 'total' is then the number of parts produced so far.
+        close = getattr(parts, 'close', None)
+        if close is not None:
+            close()
+        total = produced
     
     # The 'return' statement comes after all the except blocks
     return {
         "posted": posted_count,
-        "total": len(thread_parts),
+        "total": total,
         "final_tweet_id": in_reply_to,
-        "error": None if posted_count == len(thread_parts) else "Thread incomplete due to an error or rate limit."
+        "error": None if posted_count == total and not failed else "Thread incomplete due to an error or rate limit."
     }
\ No newline at end of file